@@ -0,0 +1,269 @@
+"""Benchmark the per-session analysis hot paths and gate regressions.
+
+Each benchmark replays synthetic transcripts or visual samples through a
+warmed-up analyzer and records ops/sec and bytes allocated per call. Run
+from ``backend/``::
+
+    python -m benchmarks.hot_paths                # print results
+    python -m benchmarks.hot_paths --save         # record benchmarks/baseline.json
+    python -m benchmarks.hot_paths --check        # exit 1 on regression
+
+Throughput is compared as a ratio to a fixed reference workload timed
+alongside each benchmark, so a baseline recorded on one machine stays
+meaningful on another and on a busy CI runner.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from benchmarks.timing import allocated_bytes, measure, reference_ops_per_second
+from pipeline.coaching_engine import CoachingEngine
+from pipeline.session_manager import compute_improvement_trend
+from pipeline.speech_analyzer import SpeechAnalyzer
+from pipeline.visual_analyzer import VisualAnalyzer
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+VOCABULARY = (
+    "we", "shipped", "the", "new", "onboarding", "flow", "and", "customers", "finished", "setup",
+    "faster", "than", "before", "our", "next", "step", "is", "to", "measure", "retention", "across",
+    "every", "cohort", "because", "that", "tells", "us", "whether", "it", "actually", "worked",
+)
+FILLERS = ("um", "uh", "like", "you know", "so", "basically", "i mean")
+EXPRESSIONS = ("neutral", "smiling", "neutral", "focused", "surprised")
+
+
+def synthetic_transcripts(seed: int = 7, filler_rate: float = 0.06) -> Iterator[tuple[str, bool]]:
+    """Yield (text, is_final) like realtime STT: growing partials, then a final."""
+    rng = random.Random(seed)
+    while True:
+        words: list[str] = []
+        for _ in range(rng.randint(8, 28)):
+            words.append(rng.choice(FILLERS) if rng.random() < filler_rate else rng.choice(VOCABULARY))
+            yield " ".join(words), False
+        yield " ".join(words).capitalize() + ".", True
+
+
+def synthetic_visual_samples(seed: int = 11) -> Iterator[dict[str, Any]]:
+    """Yield MediaPipe-style payloads with slowly drifting gaze and posture."""
+    rng = random.Random(seed)
+    gaze = 0.7
+    posture = 0.75
+    while True:
+        gaze = min(0.95, max(0.2, gaze + rng.uniform(-0.05, 0.05)))
+        posture = min(0.95, max(0.3, posture + rng.uniform(-0.02, 0.02)))
+        yield {
+            "eyeContact": rng.random() < gaze,
+            "headPose": {"pitch": rng.gauss(0, 6), "yaw": rng.gauss(0, 9), "roll": rng.gauss(0, 3)},
+            "expression": rng.choice(EXPRESSIONS),
+            "postureScore": posture,
+        }
+
+
+class Clock:
+    """Session time advancing by a fixed step per read, starting mid-session."""
+
+    def __init__(self, step: float, start: float = 1_700_000_000.0) -> None:
+        self.now = start
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def warmed_speech_analyzer(clock: Clock, minutes: float = 5.0) -> SpeechAnalyzer:
+    analyzer = SpeechAnalyzer()
+    transcripts = synthetic_transcripts(seed=3)
+    for _ in range(int(minutes * 60 / clock.step)):
+        now = clock()
+        analyzer.ingest_audio(random.uniform(0.02, 0.2), now)
+        text, is_final = next(transcripts)
+        if is_final:
+            analyzer.process_transcription(text, now, True)
+    return analyzer
+
+
+def warmed_visual_analyzer(clock: Clock) -> VisualAnalyzer:
+    analyzer = VisualAnalyzer()
+    samples = synthetic_visual_samples(seed=5)
+    for _ in range(analyzer.max_samples * 2):
+        analyzer.ingest_signal(next(samples), clock())
+    return analyzer
+
+
+def metrics_snapshots(seed: int = 13) -> Iterator[dict]:
+    rng = random.Random(seed)
+    while True:
+        yield {
+            "speech_metrics": {
+                "words_per_minute": rng.uniform(90, 190),
+                "filler_word_rate": rng.uniform(0, 9),
+                "longest_pause_seconds": rng.uniform(0, 6),
+                "total_words": rng.randint(0, 900),
+            },
+            "visual_signals": {"eye_contact_percentage": rng.uniform(20, 95)},
+        }
+
+
+def build_benchmarks() -> dict[str, Callable[[Any], Any]]:
+    """Return fresh benchmark callables; each call does one unit of hot-path work."""
+    benches: dict[str, Callable[[Any], Any]] = {}
+
+    clock = Clock(step=0.04)
+    speech = warmed_speech_analyzer(clock)
+    transcripts = synthetic_transcripts()
+    partials = itertools.cycle([text for text, final in itertools.islice(transcripts, 2000) if not final])
+    finals = itertools.cycle([text for text, final in itertools.islice(transcripts, 4000) if final])
+
+    benches["speech.process_transcription.partial"] = lambda _: speech.process_transcription(
+        next(partials), clock(), False
+    )
+    benches["speech.process_transcription.final"] = lambda _: speech.process_transcription(next(finals), clock(), True)
+    benches["speech.get_current_metrics"] = lambda _: speech.get_current_metrics(clock())
+    benches["speech.ingest_audio"] = lambda _: speech.ingest_audio(0.08, clock())
+
+    visual_clock = Clock(step=0.2)
+    visual = warmed_visual_analyzer(visual_clock)
+    samples = itertools.cycle(list(itertools.islice(synthetic_visual_samples(), 1000)))
+    benches["visual.ingest_signal"] = lambda _: visual.ingest_signal(next(samples), visual_clock())
+    benches["visual.get_current_signals"] = lambda _: visual.get_current_signals(visual_clock())
+
+    snapshots = list(itertools.islice(metrics_snapshots(), 1001))
+    pairs = itertools.cycle(list(zip(snapshots, snapshots[1:])))
+    benches["session.compute_improvement_trend"] = lambda _: compute_improvement_trend(*next(pairs))
+
+    engine = CoachingEngine(api_key=None, model="benchmark", system_prompt="")
+    coach_clock = Clock(step=0.25)
+    engine.last_coaching_time = coach_clock.now
+    coach_inputs = itertools.cycle(
+        [(snapshot["speech_metrics"], snapshot["visual_signals"], index % 7 == 0) for index, snapshot in enumerate(snapshots)]
+    )
+
+    def should_coach(_: Any) -> bool:
+        speech_metrics, visual_signals, is_final = next(coach_inputs)
+        return engine.should_coach_now(coach_clock(), speech_metrics, visual_signals, is_final)
+
+    benches["coach.should_coach_now"] = should_coach
+    return benches
+
+
+@dataclass
+class Result:
+    ops_per_second: float
+    relative_speed: float
+    alloc_bytes_per_call: float
+
+    def to_json(self) -> dict[str, float]:
+        return {
+            "ops_per_second": round(self.ops_per_second, 1),
+            "relative_speed": round(self.relative_speed, 4),
+            "alloc_bytes_per_call": round(self.alloc_bytes_per_call, 1),
+        }
+
+
+def run(min_seconds: float, repeats: int, selected: list[str] | None = None) -> dict[str, Result]:
+    """Time each benchmark next to the reference workload over ``repeats`` rounds.
+
+    Interleaving the reference with every round means CPU frequency changes
+    and noisy neighbours slow both sides alike, so ``relative_speed`` stays
+    stable where raw ops/sec swings by tens of percent. The median ratio is
+    kept, so one lucky or starved round cannot move the result.
+    """
+    results: dict[str, Result] = {}
+    for name, fn in build_benchmarks().items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        # Allocation tracing runs first on its own; tracemalloc would distort timing.
+        alloc = allocated_bytes(fn, None)
+        best_ops = 0.0
+        ratios = []
+        for _ in range(repeats):
+            reference = reference_ops_per_second(min_seconds)
+            ops = 1e6 / measure(fn, None, min_seconds)
+            best_ops = max(best_ops, ops)
+            ratios.append(ops / reference)
+        results[name] = Result(best_ops, statistics.median(ratios), alloc)
+    return results
+
+
+def check(
+    results: dict[str, Result],
+    baseline: dict,
+    threshold: float,
+    alloc_threshold: float,
+    alloc_slack: float,
+) -> list[str]:
+    """Return a description of every benchmark that regressed past its threshold."""
+    failures = []
+    for name, result in results.items():
+        recorded = baseline["benchmarks"].get(name)
+        if not recorded:
+            continue
+        floor = recorded["relative_speed"] * (1 - threshold)
+        if result.relative_speed < floor:
+            failures.append(f"{name}: relative speed {result.relative_speed:.4f}, expected >= {floor:.4f}")
+        allowed_alloc = recorded["alloc_bytes_per_call"] * (1 + alloc_threshold) + alloc_slack
+        if result.alloc_bytes_per_call > allowed_alloc:
+            failures.append(f"{name}: {result.alloc_bytes_per_call:,.0f} B/call allocated, allowed {allowed_alloc:,.0f}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.25, help="minimum timing window per benchmark")
+    parser.add_argument("--repeats", type=int, default=9, help="timing runs per benchmark; the median ratio is kept")
+    parser.add_argument("--only", action="append", help="run benchmarks whose name starts with this prefix")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any benchmark regresses")
+    # Median ratios still differ by up to ~15% between runs on shared hardware; allocations are deterministic.
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--alloc-threshold", type=float, default=0.1, help="allowed relative allocation growth")
+    parser.add_argument("--alloc-slack", type=float, default=64.0, help="allowed absolute allocation growth, bytes")
+    args = parser.parse_args()
+
+    results = run(args.seconds, args.repeats, args.only)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+
+    print(f"{'benchmark':<40}{'ops/s':>14}{'vs base':>10}{'B/call':>10}{'vs base':>10}")
+    for name, result in results.items():
+        recorded = baseline["benchmarks"].get(name) if baseline else None
+        ops_delta = alloc_delta = ""
+        if recorded:
+            ops_delta = f"{result.relative_speed / recorded['relative_speed'] - 1:+.0%}"
+            alloc_delta = f"{result.alloc_bytes_per_call - recorded['alloc_bytes_per_call']:+.0f}"
+        print(f"{name:<40}{result.ops_per_second:>14,.0f}{ops_delta:>10}{result.alloc_bytes_per_call:>10,.0f}{alloc_delta:>10}")
+
+    if args.save:
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "benchmarks": {name: result.to_json() for name, result in results.items()},
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+
+    if args.check:
+        if not baseline:
+            sys.exit(f"no baseline at {args.baseline}; run with --save first")
+        failures = check(results, baseline, args.threshold, args.alloc_threshold, args.alloc_slack)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Any, Callable
+
+
+def measure(fn: Callable[[Any], Any], arg: Any, min_seconds: float) -> float:
+    """Return mean microseconds per call, timing batches until ``min_seconds`` elapse."""
+    calls = 0
+    batch = 64
+    started = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            fn(arg)
+        calls += batch
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+        batch *= 2
+
+
+def allocated_bytes(fn: Callable[[Any], Any], arg: Any, calls: int = 200) -> float:
+    """Return mean bytes allocated per call, counting memory freed within the call.
+
+    Each call is traced separately and its high-water mark above the starting
+    point is taken, so short-lived temporaries count as well as retained data.
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(arg)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def reference_ops_per_second(min_seconds: float = 0.2) -> float:
+    """Speed of a fixed pure-Python workload, used to normalise across machines."""
+    values = list(range(256))
+
+    def workload(_: Any) -> int:
+        return sum(value * value for value in values if value % 3)
+
+    return 1e6 / measure(workload, None, min_seconds)
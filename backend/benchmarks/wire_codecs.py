@@ -0,0 +1,86 @@
+"""Compare per-message encode/decode cost of the negotiable wire codecs.
+
+Run from ``backend/``::
+
+    python -m benchmarks.wire_codecs
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+
+from benchmarks.timing import measure
+from pipeline.wire import CODECS
+
+SAMPLE_MESSAGES: dict[str, dict] = {
+    "visual_signal": {
+        "type": "visual_signal",
+        "payload": {
+            "eyeContact": True,
+            "headPose": {"pitch": 3.2, "yaw": -7.9, "roll": 1.1},
+            "expression": "smiling",
+            "postureScore": 0.82,
+        },
+    },
+    "metrics": {
+        "type": "metrics",
+        "data": {
+            "speech_metrics": {
+                "words_per_minute": 142,
+                "filler_words": {"um": 4, "like": 7, "you know": 2, "so": 5},
+                "filler_word_rate": 3.4,
+                "pause_count": 6,
+                "longest_pause_seconds": 2.8,
+                "volume_consistency": 0.74,
+                "total_words": 512,
+                "elapsed_minutes": 3.61,
+            },
+            "visual_signals": {
+                "eye_contact_percentage": 71.5,
+                "head_movement_level": "moderate",
+                "facial_expression": "neutral",
+                "posture_score": 0.66,
+            },
+            "session_context": {
+                "duration_minutes": 3.61,
+                "exercise_type": "elevator_pitch",
+                "previous_feedback_given": ["Slow down slightly before your key point."] * 3,
+                "improvement_trend": "positive",
+            },
+        },
+    },
+    "transcript": {
+        "type": "transcript",
+        "transcription": "so I think the main thing we learned this quarter is that um customers really value speed",
+        "is_final": False,
+    },
+    "status": {"type": "status", "state": "coach_thinking"},
+    "coach_response": {
+        "type": "coach_response",
+        "response_text": "Great energy. Now land each sentence before starting the next one.",
+        "audio_base64": base64.b64encode(os.urandom(48_000)).decode("ascii"),
+        "audio_mime_type": "audio/mpeg",
+        "avatar_stream_url": "https://example.invalid/room/abc",
+    },
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.2, help="minimum timing window per measurement")
+    args = parser.parse_args()
+
+    print(f"{'message':<16}{'codec':<12}{'bytes':>9}{'encode us':>12}{'decode us':>12}")
+    for message_name, message in SAMPLE_MESSAGES.items():
+        for codec in CODECS.values():
+            encoded = codec.encode(message)
+            size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+            encode_us = measure(codec.encode, message, args.seconds)
+            decode_us = measure(codec.decode, encoded, args.seconds)
+            print(f"{message_name:<16}{codec.name:<12}{size:>9}{encode_us:>12.2f}{decode_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
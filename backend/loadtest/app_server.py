@@ -0,0 +1,82 @@
+"""Serve the coaching app with an event-loop lag probe for load tests.
+
+Provider URLs and keys come from the environment, as in production. Run
+from ``backend/``::
+
+    python -m loadtest.app_server --port 9200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up from a fixed-interval sleep."""
+
+    interval: float = 0.05
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=200_000))
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def snapshot(self, reset: bool = False) -> dict[str, float | int]:
+        ordered = sorted(self.samples)
+        if reset:
+            self.samples.clear()
+        if not ordered:
+            return {"samples": 0}
+
+        def pick(quantile: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] * 1000, 3)
+
+        return {"samples": len(ordered), "p50_ms": pick(0.5), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+def read_rss_bytes(pid: int | str = "self") -> int:
+    """Resident set size from ``/proc``; Linux only."""
+    with open(f"/proc/{pid}/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def serve(host: str, port: int) -> None:
+    import uvicorn
+
+    from main import app
+
+    monitor = LoopLagMonitor()
+
+    @app.get("/loadtest/stats")
+    async def loadtest_stats(reset: bool = False) -> dict:
+        return {"loop_lag": monitor.snapshot(reset), "rss_bytes": read_rss_bytes(), "time": time.time()}
+
+    probe = asyncio.create_task(monitor.run())
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", ws_max_size=4_000_000))
+    try:
+        await server.serve()
+    finally:
+        probe.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
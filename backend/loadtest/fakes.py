@@ -0,0 +1,240 @@
+"""Local stand-ins for ElevenLabs (STT and TTS), Anthropic and Simli.
+
+Each provider answers with latencies drawn from a log-normal distribution
+given as ``median,p95`` in milliseconds. Run from ``backend/``::
+
+    python -m loadtest.fakes --port 9100 --llm-first-token 400,1200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SCRIPT_WORDS = (
+    "so today I want to walk you through how our team cut onboarding time in half "
+    "um we started by like mapping every step a new hire takes in the first week "
+    "and you know most of it was waiting on access requests so we automated those "
+    "the result is that people ship their first change on day two instead of day eight"
+).split()
+
+COACH_LINES = (
+    "Nice clear opening. Slow down a touch on the numbers so they land.",
+    "Good structure so far. Replace that um with a short pause before your key point.",
+    "Your pace is steady. Keep your eyes on the camera as you deliver the result.",
+    "Strong finish on that thought. Try one deliberate pause before the next section.",
+)
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Log-normal latency described by its median and 95th percentile."""
+
+    median_ms: float
+    p95_ms: float
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyModel:
+        median, _, p95 = spec.partition(",")
+        return cls(float(median), float(p95 or median))
+
+    def sample(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p95_ms, self.median_ms) / self.median_ms) / 1.645
+        return self.median_ms * math.exp(random.gauss(0.0, sigma)) / 1000
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.sample())
+
+
+@dataclass
+class FakeProviderConfig:
+    stt_partial: LatencyModel = LatencyModel(80, 200)
+    stt_commit: LatencyModel = LatencyModel(150, 400)
+    llm_first_token: LatencyModel = LatencyModel(400, 1200)
+    llm_token: LatencyModel = LatencyModel(15, 40)
+    tts_first_byte: LatencyModel = LatencyModel(150, 450)
+    tts_chunk: LatencyModel = LatencyModel(20, 60)
+    simli_token: LatencyModel = LatencyModel(300, 900)
+    words_per_second: float = 2.5
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_fake_app(config: FakeProviderConfig) -> FastAPI:
+    app = FastAPI(title="Speech coach provider stand-ins")
+    message_ids = itertools.count(1)
+
+    @app.get("/health")
+    async def health() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.websocket("/v1/speech-to-text/realtime")
+    async def stt(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text(json.dumps({"message_type": "session_started"}))
+        sample_rate = int(websocket.query_params.get("audio_format", "pcm_16000").removeprefix("pcm_") or 16000)
+        words = itertools.cycle(SCRIPT_WORDS)
+        utterance: list[str] = []
+        audio_seconds = 0.0
+        loop = asyncio.get_running_loop()
+        # Messages go out in order, each no earlier than its sampled latency.
+        outbox: asyncio.Queue[tuple[float, dict]] = asyncio.Queue()
+
+        async def deliver() -> None:
+            while True:
+                due, message = await outbox.get()
+                await asyncio.sleep(max(0.0, due - loop.time()))
+                await websocket.send_text(json.dumps(message))
+
+        def schedule(message: dict, latency: LatencyModel) -> None:
+            outbox.put_nowait((loop.time() + latency.sample(), message))
+
+        sender = asyncio.create_task(deliver())
+        try:
+            while True:
+                packet = json.loads(await websocket.receive_text())
+                if packet.get("message_type") != "input_audio_chunk":
+                    continue
+                # base64 inflates by 4/3; 16-bit samples.
+                audio_seconds += len(packet.get("audio_base_64", "")) * 3 / 4 / 2 / sample_rate
+                spoken = int(audio_seconds * config.words_per_second)
+                if spoken > len(utterance):
+                    utterance.extend(next(words) for _ in range(spoken - len(utterance)))
+                    schedule({"message_type": "partial_transcript", "text": " ".join(utterance)}, config.stt_partial)
+                if packet.get("commit") and utterance:
+                    text = " ".join(utterance).capitalize() + "."
+                    schedule({"message_type": "committed_transcript", "text": text}, config.stt_commit)
+                    utterance = []
+                    audio_seconds = 0.0
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            sender.cancel()
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        text = random.choice(COACH_LINES)
+        tokens = [word + " " for word in text.split()]
+        input_tokens = len(json.dumps(body)) // 4
+        message_id = f"msg_fake_{next(message_ids)}"
+
+        if not body.get("stream"):
+            await config.llm_first_token.wait()
+            for _ in tokens:
+                await config.llm_token.wait()
+            return JSONResponse(
+                {
+                    "id": message_id,
+                    "type": "message",
+                    "role": "assistant",
+                    "model": body.get("model", "fake"),
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": input_tokens, "output_tokens": len(tokens)},
+                }
+            )
+
+        async def events():
+            yield _sse(
+                "message_start",
+                {
+                    "type": "message_start",
+                    "message": {
+                        "id": message_id,
+                        "type": "message",
+                        "role": "assistant",
+                        "model": body.get("model", "fake"),
+                        "content": [],
+                        "stop_reason": None,
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+                    },
+                },
+            )
+            yield _sse(
+                "content_block_start",
+                {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+            )
+            await config.llm_first_token.wait()
+            for token in tokens:
+                yield _sse(
+                    "content_block_delta",
+                    {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": token}},
+                )
+                await config.llm_token.wait()
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse(
+                "message_delta",
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": len(tokens)},
+                },
+            )
+            yield _sse("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/text-to-speech/{voice_id}/stream")
+    async def tts(voice_id: str, request: Request):
+        body = await request.json()
+        # Roughly 128 kbps audio at ~14 characters per second of speech.
+        total = max(2048, len(body.get("text", "")) * 1200)
+
+        async def audio():
+            await config.tts_first_byte.wait()
+            sent = 0
+            while sent < total:
+                size = min(4096, total - sent)
+                yield bytes(size)
+                sent += size
+                await config.tts_chunk.wait()
+
+        return StreamingResponse(audio(), media_type="audio/mpeg")
+
+    @app.post("/compose/token")
+    async def simli_token() -> dict[str, str]:
+        await config.simli_token.wait()
+        return {"roomUrl": f"https://simli.invalid/room/{random.getrandbits(48):x}", "sessionToken": "fake"}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    defaults = FakeProviderConfig()
+    latency_fields = [name for name, value in vars(defaults).items() if isinstance(value, LatencyModel)]
+    for name in latency_fields:
+        model: LatencyModel = getattr(defaults, name)
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=LatencyModel.parse,
+            default=model,
+            help=f"median,p95 in ms (default {model.median_ms:g},{model.p95_ms:g})",
+        )
+    args = parser.parse_args()
+
+    config = FakeProviderConfig(**{name: getattr(args, name) for name in latency_fields})
+    uvicorn.run(create_fake_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Drive N concurrent simulated coaching sessions against a local app server.
+
+Starts the provider stand-ins and the app in subprocesses, connects the
+clients, and reports latency percentiles, event-loop lag and RSS per
+session. Runs offline on Linux. From ``backend/``::
+
+    python -m loadtest.run --sessions 50 --duration 45
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import math
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import websockets
+
+from loadtest.app_server import read_rss_bytes
+from pipeline.audio_frames import FRAME_KIND_TTS, TTS_FRAME_HEADER
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 0.04
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def pcm_chunk(speaking: bool, phase: float) -> tuple[str, float]:
+    """Base64 PCM for one chunk of a 180 Hz tone (speech) or low noise (silence)."""
+    count = int(SAMPLE_RATE * CHUNK_SECONDS)
+    amplitude = 0.2 if speaking else 0.0
+    samples = [
+        amplitude * math.sin(2 * math.pi * 180 * (phase + i / SAMPLE_RATE)) + random.gauss(0.0, 0.003)
+        for i in range(count)
+    ]
+    rms = math.sqrt(sum(value * value for value in samples) / count)
+    pcm = struct.pack(f"<{count}h", *(int(max(-1.0, min(1.0, value)) * 32767) for value in samples))
+    return base64.b64encode(pcm).decode("ascii"), rms
+
+
+@dataclass
+class SessionTimings:
+    transcript_to_metrics: list[float] = field(default_factory=list)
+    transcript_to_coach_text: list[float] = field(default_factory=list)
+    transcript_to_audio: list[float] = field(default_factory=list)
+    finals: int = 0
+    coach_responses: int = 0
+    errors: list[str] = field(default_factory=list)
+    completed: bool = False
+
+
+async def run_client(
+    url: str,
+    session_id: str,
+    duration: float,
+    speech_seconds: float,
+    pause_seconds: float,
+) -> SessionTimings:
+    timings = SessionTimings()
+    last_final: float | None = None
+    last_transcript: float | None = None
+    awaiting_metrics = False
+    coach_anchor: float | None = None
+    audio_streams: dict[int, float] = {}
+    summary_received = asyncio.Event()
+
+    async def receive(ws) -> None:
+        nonlocal last_final, last_transcript, awaiting_metrics, coach_anchor
+        async for raw in ws:
+            now = time.perf_counter()
+            if isinstance(raw, bytes):
+                if raw[:1] == bytes((FRAME_KIND_TTS,)) and len(raw) > TTS_FRAME_HEADER.size:
+                    _, _, stream_id, _ = TTS_FRAME_HEADER.unpack_from(raw)
+                    anchor = audio_streams.pop(stream_id, None)
+                    if anchor is not None:
+                        timings.transcript_to_audio.append(now - anchor)
+                continue
+
+            message = json.loads(raw)
+            kind = message.get("type")
+            if kind == "transcript":
+                last_transcript = now
+                if message.get("is_final"):
+                    last_final = now
+                    awaiting_metrics = True
+                    timings.finals += 1
+            elif kind in {"metrics", "metrics_delta"} and awaiting_metrics and last_final is not None:
+                timings.transcript_to_metrics.append(now - last_final)
+                awaiting_metrics = False
+            elif kind == "status" and message.get("state") == "coach_thinking":
+                # Coaching can also be triggered by a partial, so anchor on the latest transcript.
+                coach_anchor = last_transcript
+            elif kind == "coach_response" and coach_anchor is not None:
+                if message.get("segment_index", 0) == 0:
+                    timings.transcript_to_coach_text.append(now - coach_anchor)
+                    timings.coach_responses += 1
+                    if message.get("audio_stream_id") is not None:
+                        audio_streams[message["audio_stream_id"]] = coach_anchor
+            elif kind == "error":
+                timings.errors.append(str(message.get("message")))
+            elif kind == "session_summary":
+                timings.completed = True
+                summary_received.set()
+                return
+
+    try:
+        async with websockets.connect(f"{url}/ws/session/{session_id}", max_size=8_000_000) as ws:
+            receiver = asyncio.create_task(receive(ws))
+            await ws.send(json.dumps({"type": "configure", "tts_transport": "stream", "coach_segments": True}))
+            await ws.send(json.dumps({"type": "start_session", "exercise_type": "elevator_pitch"}))
+
+            started = time.perf_counter()
+            next_tick = started
+            phase = 0.0
+            while (elapsed := time.perf_counter() - started) < duration:
+                speaking = elapsed % (speech_seconds + pause_seconds) < speech_seconds
+                chunk, rms = pcm_chunk(speaking, phase)
+                phase += CHUNK_SECONDS
+                await ws.send(
+                    json.dumps({"type": "audio_chunk", "chunk": chunk, "rms": rms, "sample_rate": SAMPLE_RATE})
+                )
+                if int(elapsed / CHUNK_SECONDS) % 5 == 0:
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "type": "visual_signal",
+                                "payload": {
+                                    "eyeContact": random.random() > 0.3,
+                                    "headPose": {"pitch": random.uniform(-8, 8), "yaw": random.uniform(-12, 12)},
+                                    "expression": random.choice(["neutral", "smiling"]),
+                                    "postureScore": random.uniform(0.5, 0.9),
+                                },
+                            }
+                        )
+                    )
+                next_tick += CHUNK_SECONDS
+                await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+            await ws.send(json.dumps({"type": "end_session"}))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(summary_received.wait(), timeout=15)
+            receiver.cancel()
+    except Exception as error:
+        timings.errors.append(f"{type(error).__name__}: {error}")
+    return timings
+
+
+def percentiles(values: list[float]) -> dict[str, float | int]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(quantile: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] * 1000, 1)
+
+    return {"count": len(ordered), "p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            with contextlib.suppress(httpx.HTTPError):
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    fakes_port = free_port()
+    app_port = free_port()
+    fakes_url = f"http://127.0.0.1:{fakes_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    workdir = tempfile.mkdtemp(prefix="speechcoach-loadtest-")
+
+    latency_flags = [
+        f"--{name}={value}"
+        for name, value in (
+            ("stt-commit", args.stt_latency),
+            ("llm-first-token", args.llm_latency),
+            ("tts-first-byte", args.tts_latency),
+        )
+        if value
+    ]
+    env = {
+        **os.environ,
+        "ANTHROPIC_API_KEY": "loadtest",
+        "ANTHROPIC_BASE_URL": fakes_url,
+        "ELEVENLABS_API_KEY": "loadtest",
+        "ELEVENLABS_API_BASE": fakes_url,
+        "ELEVENLABS_STT_URL": f"ws://127.0.0.1:{fakes_port}/v1/speech-to-text/realtime",
+        "SIMLI_API_KEY": "loadtest",
+        "SIMLI_FACE_ID": "loadtest",
+        "SIMLI_API_BASE": fakes_url,
+        "SESSION_DB_PATH": os.path.join(workdir, "sessions.db"),
+        "TTS_PREWARM": "0",
+    }
+
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "loadtest.fakes", "--port", str(fakes_port), *latency_flags],
+            cwd=BACKEND_DIR,
+            env=env,
+        ),
+    ]
+    try:
+        await wait_ready(fakes_url)
+        app_process = subprocess.Popen(
+            [sys.executable, "-m", "loadtest.app_server", "--port", str(app_port)],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        processes.append(app_process)
+        await wait_ready(app_url)
+
+        async with httpx.AsyncClient(base_url=app_url) as client:
+            await client.get("/loadtest/stats", params={"reset": True})
+            baseline_rss = read_rss_bytes(app_process.pid)
+            peak_rss = baseline_rss
+
+            async def sample_rss() -> None:
+                nonlocal peak_rss
+                while True:
+                    peak_rss = max(peak_rss, read_rss_bytes(app_process.pid))
+                    await asyncio.sleep(0.5)
+
+            sampler = asyncio.create_task(sample_rss())
+            ws_url = f"ws://127.0.0.1:{app_port}"
+            clients = []
+            for index in range(args.sessions):
+                clients.append(
+                    asyncio.create_task(
+                        run_client(ws_url, f"loadtest-{index}", args.duration, args.speech_seconds, args.pause_seconds)
+                    )
+                )
+                await asyncio.sleep(args.ramp / max(args.sessions, 1))
+            results: list[SessionTimings] = await asyncio.gather(*clients)
+            sampler.cancel()
+            server_stats = (await client.get("/loadtest/stats")).json()
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                process.wait(timeout=10)
+
+    errors = [error for result in results for error in result.errors]
+    return {
+        "sessions": args.sessions,
+        "completed": sum(result.completed for result in results),
+        "finals": sum(result.finals for result in results),
+        "coach_responses": sum(result.coach_responses for result in results),
+        "transcript_to_metrics": percentiles([v for r in results for v in r.transcript_to_metrics]),
+        "transcript_to_coach_text": percentiles([v for r in results for v in r.transcript_to_coach_text]),
+        "transcript_to_audio": percentiles([v for r in results for v in r.transcript_to_audio]),
+        "loop_lag": server_stats["loop_lag"],
+        "rss_baseline_mb": round(baseline_rss / 2**20, 1),
+        "rss_peak_mb": round(peak_rss / 2**20, 1),
+        "rss_per_session_kb": round((peak_rss - baseline_rss) / max(args.sessions, 1) / 1024, 1),
+        "errors": len(errors),
+        "sample_errors": errors[:5],
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"sessions {report['completed']}/{report['sessions']} completed, "
+        f"{report['finals']} final transcripts, {report['coach_responses']} coach responses, "
+        f"{report['errors']} errors"
+    )
+    print(f"{'latency':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in ("transcript_to_metrics", "transcript_to_coach_text", "transcript_to_audio"):
+        stats = report[name]
+        print(
+            f"{name:<28}{stats['count']:>7}{stats.get('p50_ms', '-'):>10}"
+            f"{stats.get('p95_ms', '-'):>10}{stats.get('p99_ms', '-'):>10}"
+        )
+    lag = report["loop_lag"]
+    print(
+        f"event loop lag: p50 {lag.get('p50_ms', '-')} ms, p99 {lag.get('p99_ms', '-')} ms, "
+        f"max {lag.get('max_ms', '-')} ms"
+    )
+    print(
+        f"rss: baseline {report['rss_baseline_mb']} MB, peak {report['rss_peak_mb']} MB, "
+        f"{report['rss_per_session_kb']} KB per session"
+    )
+    for error in report["sample_errors"]:
+        print(f"error: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=45.0, help="seconds each client streams audio")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which clients connect")
+    parser.add_argument("--speech-seconds", type=float, default=3.0)
+    parser.add_argument("--pause-seconds", type=float, default=1.2)
+    parser.add_argument("--stt-latency", help="STT commit latency as median,p95 ms")
+    parser.add_argument("--llm-latency", help="LLM first-token latency as median,p95 ms")
+    parser.add_argument("--tts-latency", help="TTS first-byte latency as median,p95 ms")
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
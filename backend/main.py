@@ -2,19 +2,49 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
+import contextlib
 import os
 import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable
-from urllib.parse import urlencode
+from typing import Any
 
-import websockets
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from pipeline import AvatarManager, CoachingEngine, SessionManager, SpeechAnalyzer, VisualAnalyzer
+from pipeline.audio_frames import (
+    FRAME_KIND_AUDIO,
+    TTS_FLAG_CANCELLED,
+    TTS_FLAG_END,
+    TTS_FLAG_ERROR,
+    pack_tts_frame,
+    parse_audio_frame,
+)
+from pipeline.avatar_manager import TTS_OUTPUT_FORMATS
+from pipeline.coach_scheduler import ROUTINE, URGENT, CoachScheduler, CoachTrigger
+from pipeline.coaching_engine import FALLBACK_RESPONSES
+from pipeline.filler_lexicon import load_lexicon_dir
+from pipeline.http_pool import UpstreamHTTPPool
+from pipeline.metrics_publisher import MetricsPublisher
+from pipeline.session_manager import compute_improvement_trend
+from pipeline.session_store import LocalStateStore, SQLiteStateStore
+from pipeline.simli_tokens import SimliTokenPool
+from pipeline.speculation import Speculator
+from pipeline.stt_client import (
+    ELEVENLABS_STT_ENDPOINT,
+    ElevenLabsRealtimeSTTClient,
+    normalize_commit_strategy,
+    open_stt_socket,
+    stt_url,
+)
+from pipeline.stt_pool import STTConnectionPool, STTPoolKey
+from pipeline.telemetry import CONTENT_TYPE_LATEST, Telemetry, TurnTrace
+from pipeline.tts_cache import TTSCache
+from pipeline.voice_activity import VoiceActivityDetector
+from pipeline.wire import fast_loads, negotiate
 from prompts.coach_system import COACH_SYSTEM_PROMPT
 
 load_dotenv()
@@ -43,201 +73,144 @@ class AppConfig:
     elevenlabs_api_key: str | None = os.getenv("ELEVENLABS_API_KEY")
     simli_api_key: str | None = os.getenv("SIMLI_API_KEY")
     simli_face_id: str | None = os.getenv("SIMLI_FACE_ID")
+    elevenlabs_api_base: str = os.getenv("ELEVENLABS_API_BASE", "https://api.elevenlabs.io")
+    elevenlabs_stt_url: str = os.getenv("ELEVENLABS_STT_URL", ELEVENLABS_STT_ENDPOINT)
+    simli_api_base: str = os.getenv("SIMLI_API_BASE", "https://api.simli.ai")
+    session_db_path: str = os.getenv("SESSION_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "sessions.db"))
+    session_store: str = os.getenv("SESSION_STORE", "local")
+    session_state_db_path: str = os.getenv(
+        "SESSION_STATE_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "session_state.db")
+    )
+    session_state_ttl: float = float(os.getenv("SESSION_STATE_TTL_SECONDS", "900"))
+    session_checkpoint_seconds: float = float(os.getenv("SESSION_CHECKPOINT_SECONDS", "5"))
     anthropic_model: str = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
+    anthropic_prompt_caching: bool = os.getenv("ANTHROPIC_PROMPT_CACHING", "1") not in {"0", "false", "no"}
+    anthropic_max_input_tokens: int = int(os.getenv("ANTHROPIC_MAX_INPUT_TOKENS", "6000"))
     elevenlabs_stt_model: str = os.getenv("ELEVENLABS_STT_MODEL", "scribe_v2_realtime")
-    elevenlabs_stt_commit_strategy: str = os.getenv("ELEVENLABS_STT_COMMIT_STRATEGY", "manual")
-
-
-class ElevenLabsRealtimeSTTClient:
-    """Realtime STT client backed by ElevenLabs Scribe v2."""
-
-    def __init__(
-        self,
-        api_key: str | None,
-        on_transcript: Callable[[str, bool, float], Awaitable[None]],
-        on_error: Callable[[str], Awaitable[None]] | None = None,
-        model_id: str = "scribe_v2_realtime",
-        commit_strategy: str = "vad",
-        sample_rate: int = 16000,
-    ) -> None:
-        self.api_key = api_key
-        self.on_transcript = on_transcript
-        self.on_error = on_error
-        self.model_id = model_id
-        self.commit_strategy = commit_strategy if commit_strategy in {"manual", "vad"} else "vad"
-        self.sample_rate = sample_rate
-        self.ws = None
-        self.audio_queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=96)
-        self.sender_task: asyncio.Task | None = None
-        self.receiver_task: asyncio.Task | None = None
-
-    @property
-    def enabled(self) -> bool:
-        return bool(self.api_key)
-
-    async def connect(self) -> None:
-        if not self.api_key:
-            return
-
-        endpoint = "wss://api.elevenlabs.io/v1/speech-to-text/realtime"
-        query = urlencode(
-            {
-                "model_id": self.model_id,
-                "audio_format": f"pcm_{self.sample_rate}",
-                "language_code": "en",
-                "include_timestamps": "true",
-                "commit_strategy": self.commit_strategy,
-                "vad_silence_threshold_secs": "1.0",
-            }
-        )
+    elevenlabs_stt_commit_strategy: str = normalize_commit_strategy(
+        os.getenv("ELEVENLABS_STT_COMMIT_STRATEGY", "manual")
+    )
+    stt_language: str = os.getenv("STT_LANGUAGE", "en")
+    stt_max_buffer_seconds: float = float(os.getenv("STT_MAX_BUFFER_SECONDS", "3"))
+    stt_replay_seconds: float = float(os.getenv("STT_REPLAY_SECONDS", "5"))
+    stt_chunk_ms: float = float(os.getenv("STT_CHUNK_MS", "160"))
+    stt_chunk_max_delay_ms: float = float(os.getenv("STT_CHUNK_MAX_DELAY_MS", "250"))
+    stt_pool_min_size: int = int(os.getenv("STT_POOL_MIN_SIZE", "1"))
+    stt_pool_max_size: int = int(os.getenv("STT_POOL_MAX_SIZE", "4"))
+    stt_pool_max_age: float = float(os.getenv("STT_POOL_MAX_AGE_SECONDS", "45"))
+    filler_lexicon_dir: str | None = os.getenv("FILLER_LEXICON_DIR")
+    server_vad: bool = os.getenv("SERVER_VAD", "1") not in {"0", "false", "no"}
+    vad_hangover_ms: float = float(os.getenv("VAD_HANGOVER_MS", "350"))
+    visual_window_seconds: float | None = float(os.getenv("VISUAL_WINDOW_SECONDS", "0")) or None
+    # Sentence-segmented coach_response delivery; clients can also opt in via configure.
+    coach_streaming: bool = os.getenv("COACH_STREAMING", "0") in {"1", "true", "yes"}
+    coach_min_run_seconds: float = float(os.getenv("COACH_MIN_RUN_SECONDS", "2"))
+    coach_speculation: bool = os.getenv("COACH_SPECULATION", "1") not in {"0", "false", "no"}
+    coach_speculation_lead: float = float(os.getenv("COACH_SPECULATION_LEAD_SECONDS", "3"))
+    coach_speculation_threshold: float = float(os.getenv("COACH_SPECULATION_THRESHOLD", "0.85"))
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "1") not in {"0", "false", "no"}
+    tts_cache_mb: float = float(os.getenv("TTS_CACHE_MB", "32"))
+    tts_cache_dir: str | None = os.getenv("TTS_CACHE_DIR")
+    tts_cache_disk_mb: float = float(os.getenv("TTS_CACHE_DISK_MB", "256"))
+    tts_prewarm: bool = os.getenv("TTS_PREWARM", "1") not in {"0", "false", "no"}
+    tts_prewarm_phrases: str = os.getenv("TTS_PREWARM_PHRASES", "")
+    tts_prewarm_formats: str = os.getenv("TTS_PREWARM_FORMATS", "mp3")
+    simli_token_pool_size: int = int(os.getenv("SIMLI_TOKEN_POOL_SIZE", "2"))
+    simli_token_ttl: float = float(os.getenv("SIMLI_TOKEN_TTL_SECONDS", "240"))
+    metrics_tick_hz: float = float(os.getenv("METRICS_TICK_HZ", "4"))
+    upstream_http2: bool = os.getenv("UPSTREAM_HTTP2", "0") in {"1", "true", "yes"}
+    upstream_max_connections_per_host: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS_PER_HOST", "20"))
 
-        self.ws = await websockets.connect(
-            f"{endpoint}?{query}",
-            additional_headers={"xi-api-key": self.api_key},
-            ping_interval=20,
-            ping_timeout=20,
-            max_size=2_000_000,
+
+def create_app() -> FastAPI:
+    config = AppConfig()
+    http_pool = UpstreamHTTPPool(
+        http2=config.upstream_http2,
+        max_connections_per_host=config.upstream_max_connections_per_host,
+    )
+    tts_cache = (
+        TTSCache(
+            max_bytes=int(config.tts_cache_mb * 1024 * 1024),
+            disk_dir=config.tts_cache_dir,
+            max_disk_bytes=int(config.tts_cache_disk_mb * 1024 * 1024),
         )
+        if config.tts_cache_mb > 0
+        else None
+    )
 
-        self.sender_task = asyncio.create_task(self._sender())
-        self.receiver_task = asyncio.create_task(self._receiver())
+    simli_tokens: SimliTokenPool | None = None
 
-    async def send_audio(self, pcm_chunk: bytes, sample_rate: int | None = None) -> None:
-        if not self.enabled:
-            return
+    def new_avatar_manager() -> AvatarManager:
+        return AvatarManager(
+            elevenlabs_api_key=config.elevenlabs_api_key,
+            simli_api_key=config.simli_api_key,
+            simli_face_id=config.simli_face_id,
+            http_pool=http_pool,
+            tts_cache=tts_cache,
+            simli_tokens=simli_tokens,
+            elevenlabs_base_url=config.elevenlabs_api_base,
+            simli_base_url=config.simli_api_base,
+        )
 
-        packet = {
-            "message_type": "input_audio_chunk",
-            "audio_base_64": base64.b64encode(pcm_chunk).decode("ascii"),
-            "commit": False,
-            "sample_rate": sample_rate or self.sample_rate,
-        }
+    if has_real_key(config.simli_api_key) and config.simli_token_pool_size > 0:
+        token_minter = new_avatar_manager()
+        simli_tokens = SimliTokenPool(
+            mint=lambda: token_minter.create_simli_token(None),
+            target_size=config.simli_token_pool_size,
+            token_ttl=config.simli_token_ttl,
+        )
 
-        try:
-            self.audio_queue.put_nowait(packet)
-        except asyncio.QueueFull:
-            # Drop oldest packet under pressure to keep latency low.
-            _ = self.audio_queue.get_nowait()
-            self.audio_queue.put_nowait(packet)
-
-    async def commit(self, sample_rate: int | None = None) -> None:
-        if not self.enabled:
-            return
-
-        packet = {
-            "message_type": "input_audio_chunk",
-            "audio_base_64": "",
-            "commit": True,
-            "sample_rate": sample_rate or self.sample_rate,
-        }
+    stt_pool: STTConnectionPool | None = None
+    if has_real_key(config.elevenlabs_api_key) and config.stt_pool_max_size > 0:
+        stt_pool = STTConnectionPool(
+            open=lambda key: open_stt_socket(stt_url(config.elevenlabs_stt_url, *key), config.elevenlabs_api_key),
+            min_size=config.stt_pool_min_size,
+            max_size=config.stt_pool_max_size,
+            max_age=config.stt_pool_max_age,
+        )
+        stt_pool.register(
+            STTPoolKey(config.elevenlabs_stt_model, 16000, config.stt_language, config.elevenlabs_stt_commit_strategy)
+        )
 
+    telemetry = Telemetry(enabled=config.metrics_enabled)
+    if stt_pool:
+        telemetry.add_app_source("stt_pool", stt_pool.stats)
+    if tts_cache:
+        telemetry.add_app_source("tts_cache", tts_cache.stats)
+
+    async def prewarm_tts() -> None:
+        phrases = [*FALLBACK_RESPONSES.values(), *filter(None, (p.strip() for p in config.tts_prewarm_phrases.split("|")))]
+        formats = [f.strip() for f in config.tts_prewarm_formats.split(",") if f.strip()]
+        await new_avatar_manager().prewarm(phrases, formats)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        prewarm_task = None
+        if tts_cache and config.tts_prewarm and has_real_key(config.elevenlabs_api_key):
+            prewarm_task = asyncio.create_task(prewarm_tts())
+        if simli_tokens:
+            simli_tokens.schedule_refill()
+        if stt_pool:
+            stt_pool.start()
         try:
-            self.audio_queue.put_nowait(packet)
-        except asyncio.QueueFull:
-            _ = self.audio_queue.get_nowait()
-            self.audio_queue.put_nowait(packet)
-
-    async def _sender(self) -> None:
-        if not self.ws:
-            return
-
-        while True:
-            packet = await self.audio_queue.get()
-            if packet is None:
-                break
-            await self.ws.send(json.dumps(packet))
-
-    async def _receiver(self) -> None:
-        if not self.ws:
-            return
-
-        async for payload in self.ws:
-            if not isinstance(payload, str):
-                continue
-
-            try:
-                message = json.loads(payload)
-            except json.JSONDecodeError:
-                continue
-
-            message_type = message.get("message_type")
-
-            if message_type in {"partial_transcript", "committed_transcript", "committed_transcript_with_timestamps"}:
-                transcript = (message.get("text") or "").strip()
-                if not transcript:
-                    continue
-                is_final = message_type != "partial_transcript"
-                await self.on_transcript(transcript, is_final, time.time())
-                continue
-
-            if message_type == "session_started":
-                continue
-
-            if message_type in {
-                "warning",
-                "auth_error",
-                "quota_exceeded_error",
-                "transcriber_error",
-                "input_error",
-                "commit_throttled",
-                "unaccepted_terms_error",
-                "rate_limited",
-                "queue_overflow",
-                "resource_exhausted",
-                "session_time_limit_exceeded",
-                "chunk_size_exceeded",
-                "insufficient_audio_activity",
-                "error",
-            } and self.on_error:
-                detail = message.get("detail") or message.get("error") or message.get("message") or message
-                await self.on_error(str(detail))
-                continue
-
-    async def close(self) -> None:
-        if self.enabled:
-            await self.audio_queue.put(None)
-
-        if self.sender_task:
-            with contextlib.suppress(Exception):
-                await self.sender_task
-
-        if self.receiver_task:
-            self.receiver_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError, Exception):
-                await self.receiver_task
-
-        if self.ws:
-            with contextlib.suppress(Exception):
-                await self.ws.close()
-            self.ws = None
-
-
-# contextlib is imported late to keep top-level imports minimal.
-import contextlib  # noqa: E402
-
-
-def compute_improvement_trend(previous: dict | None, current: dict) -> str:
-    if not previous:
-        return "neutral"
-
-    prev_filler = previous.get("speech_metrics", {}).get("filler_word_rate", 0)
-    curr_filler = current.get("speech_metrics", {}).get("filler_word_rate", 0)
-
-    prev_eye = previous.get("visual_signals", {}).get("eye_contact_percentage", 0)
-    curr_eye = current.get("visual_signals", {}).get("eye_contact_percentage", 0)
-
-    if curr_filler <= prev_filler and curr_eye >= prev_eye:
-        return "positive"
-
-    if curr_filler > prev_filler + 1.0 or curr_eye + 8 < prev_eye:
-        return "negative"
-
-    return "neutral"
-
-
-def create_app() -> FastAPI:
-    config = AppConfig()
-    app = FastAPI(title="AI Speech Coach Backend", version="0.1.0")
+            yield
+        finally:
+            if prewarm_task:
+                prewarm_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await prewarm_task
+            if simli_tokens:
+                await simli_tokens.aclose()
+            if stt_pool:
+                await stt_pool.aclose()
+            await http_pool.aclose()
+            await session_manager.flush()
+            await asyncio.to_thread(session_manager.close)
+
+    app = FastAPI(title="AI Speech Coach Backend", version="0.1.0", lifespan=lifespan)
+
+    if config.filler_lexicon_dir:
+        load_lexicon_dir(config.filler_lexicon_dir)
 
     app.add_middleware(
         CORSMiddleware,
@@ -247,8 +220,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    data_path = os.path.join(os.path.dirname(__file__), "data", "sessions.db")
-    session_manager = SessionManager(db_path=data_path)
+    # "sqlite" shares session state between workers on one host; "local" keeps it in-process.
+    session_store = (
+        SQLiteStateStore(config.session_state_db_path) if config.session_store == "sqlite" else LocalStateStore()
+    )
+    session_manager = SessionManager(
+        db_path=config.session_db_path, store=session_store, state_ttl=config.session_state_ttl
+    )
 
     @app.get("/health")
     async def health() -> dict[str, Any]:
@@ -263,70 +241,322 @@ def create_app() -> FastAPI:
             },
         }
 
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        if not telemetry.enabled:
+            raise HTTPException(status_code=404, detail="Metrics are disabled or prometheus_client is not installed")
+        return Response(telemetry.render(), media_type=CONTENT_TYPE_LATEST)
+
+    @app.get("/sessions/{session_id}")
+    async def session_detail(session_id: str) -> dict[str, Any]:
+        record = await session_manager.load_session(session_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return record
+
     @app.websocket("/ws/session/{session_id}")
     async def websocket_session(websocket: WebSocket, session_id: str) -> None:
-        await websocket.accept()
+        codec, subprotocol = negotiate(
+            websocket.scope.get("subprotocols", []),
+            websocket.query_params.get("protocol"),
+        )
+        await websocket.accept(subprotocol=subprotocol)
 
-        speech_analyzer = SpeechAnalyzer()
-        visual_analyzer = VisualAnalyzer()
+        speech_analyzer = SpeechAnalyzer(language=config.stt_language)
+        visual_analyzer = VisualAnalyzer(window_seconds=config.visual_window_seconds)
         coaching_engine = CoachingEngine(
             api_key=config.anthropic_api_key,
             model=config.anthropic_model,
             system_prompt=COACH_SYSTEM_PROMPT,
+            prompt_caching=config.anthropic_prompt_caching,
+            max_input_tokens=config.anthropic_max_input_tokens,
+            speculation_lead=config.coach_speculation_lead,
         )
-        avatar_manager = AvatarManager(
-            elevenlabs_api_key=config.elevenlabs_api_key,
-            simli_api_key=config.simli_api_key,
-            simli_face_id=config.simli_face_id,
-        )
+        speculator = Speculator(threshold=config.coach_speculation_threshold)
+        avatar_manager = new_avatar_manager()
+        tracer = telemetry.tracer()
 
         send_lock = asyncio.Lock()
-        session_manager.ensure(session_id)
+        saved_state = await session_manager.attach(session_id)
+        if saved_state:
+            speech_analyzer.restore(saved_state["speech"])
+            visual_analyzer.restore(saved_state["visual"])
+            coaching_engine.restore(saved_state["coach"])
+        session_ended = False
+        checkpoint_task: asyncio.Task | None = None
+        last_checkpoint = time.monotonic()
         avatar_stream_url: str | None = None
+        avatar_task: asyncio.Task | None = None
         last_final_transcript = ""
         last_final_timestamp = 0.0
+        latest_partial: tuple[str, dict] | None = None
+        tts_streaming = False
+        coach_segments = config.coach_streaming
+        tts_format = "mp3"
+        tts_stream_counter = 0
+
+        async def save_session_state() -> None:
+            await session_manager.checkpoint(
+                session_id,
+                {
+                    "speech": speech_analyzer.snapshot(),
+                    "visual": visual_analyzer.snapshot(),
+                    "coach": coaching_engine.snapshot(),
+                },
+            )
+
+        def schedule_checkpoint() -> None:
+            # Throttled; a disconnect always saves, this bounds what a crashed worker loses.
+            nonlocal checkpoint_task, last_checkpoint
+            now = time.monotonic()
+            if checkpoint_task and not checkpoint_task.done():
+                return
+            if now - last_checkpoint < config.session_checkpoint_seconds:
+                return
+            last_checkpoint = now
+            checkpoint_task = asyncio.create_task(save_session_state())
 
         async def send(payload: dict[str, Any]) -> None:
+            data = codec.encode(payload)
             async with send_lock:
-                await websocket.send_json(payload)
+                if codec.binary:
+                    await websocket.send_bytes(data)
+                else:
+                    await websocket.send_text(data)
+
+        def build_metrics_payload() -> dict:
+            now = time.time()
+            return {
+                "speech_metrics": speech_analyzer.get_current_metrics(now),
+                "visual_signals": visual_analyzer.get_current_signals(now),
+                "session_context": session_manager.session_context(session_id),
+            }
 
-        async def run_coach_response(transcript: str, metrics_payload: dict) -> None:
+        metrics_publisher = MetricsPublisher(
+            send=send,
+            build=build_metrics_payload,
+            sample=lambda payload: session_manager.sample_metrics(session_id, payload),
+            interval=1.0 / max(config.metrics_tick_hz, 0.1),
+        )
+
+        async def send_bytes(data: bytes) -> None:
+            async with send_lock:
+                await websocket.send_bytes(data)
+
+        async def stream_coach_audio(response_text: str, trace: TurnTrace, segment_index: int | None = None) -> None:
+            nonlocal tts_stream_counter
+            tts_stream_counter = (tts_stream_counter + 1) & 0xFFFF
+            stream_id = tts_stream_counter
+            payload = {
+                "type": "coach_response",
+                "response_text": response_text,
+                "audio_base64": None,
+                "audio_mime_type": avatar_manager.tts_mime_type(tts_format),
+                "audio_stream_id": stream_id,
+                "avatar_stream_url": avatar_stream_url,
+            }
+            if segment_index is not None:
+                payload["segment_index"] = segment_index
+            await send(payload)
+            trace.mark("coach_response_sent")
+
+            sequence = 0
+            flags = TTS_FLAG_END
+            try:
+                async for chunk in avatar_manager.stream_speech(response_text, tts_format):
+                    trace.mark("tts_first_byte")
+                    await send_bytes(pack_tts_frame(stream_id, sequence, chunk))
+                    sequence += 1
+                trace.mark("tts_complete")
+            except asyncio.CancelledError:
+                with contextlib.suppress(Exception):
+                    await send_bytes(pack_tts_frame(stream_id, sequence, flags=TTS_FLAG_END | TTS_FLAG_CANCELLED))
+                raise
+            except Exception:
+                flags |= TTS_FLAG_ERROR
+            await send_bytes(pack_tts_frame(stream_id, sequence, flags=flags))
+
+        def remember_avatar_stream(task: asyncio.Task) -> None:
             nonlocal avatar_stream_url
+            if not task.cancelled() and task.exception() is None and task.result():
+                avatar_stream_url = task.result()
+
+        def start_avatar_setup() -> None:
+            # Simli setup runs in the background from connect time so it overlaps
+            # with STT, the LLM and TTS instead of following them.
+            nonlocal avatar_task
+            if avatar_stream_url or (avatar_task and not avatar_task.done()):
+                return
+            avatar_task = asyncio.create_task(avatar_manager.prepare_avatar_stream(session_id))
+            avatar_task.add_done_callback(remember_avatar_stream)
+
+        async def ensure_avatar_stream() -> str | None:
+            start_avatar_setup()
+            if avatar_task and not avatar_stream_url:
+                # Shielded so an interrupted coach turn does not abort avatar setup.
+                with contextlib.suppress(Exception):
+                    await asyncio.shield(avatar_task)
+            return avatar_stream_url
+
+        async def deliver_coach_segment(
+            response_text: str,
+            trace: TurnTrace,
+            audio_task: asyncio.Task | None = None,
+            segment_index: int | None = None,
+        ) -> None:
+            if tts_streaming:
+                await ensure_avatar_stream()
+                trace.mark("avatar_ready")
+                await stream_coach_audio(response_text, trace, segment_index)
+                return
+
+            if audio_task is None:
+                audio_task = asyncio.create_task(avatar_manager.synthesize_speech(response_text))
+            try:
+                await ensure_avatar_stream()
+                trace.mark("avatar_ready")
+                audio_base64, audio_mime = await audio_task
+            except asyncio.CancelledError:
+                audio_task.cancel()
+                raise
+            # Inline audio arrives whole, so first byte and completion coincide.
+            trace.mark("tts_first_byte")
+            trace.mark("tts_complete")
+
+            payload = {
+                "type": "coach_response",
+                "response_text": response_text,
+                "audio_base64": audio_base64,
+                "audio_mime_type": audio_mime,
+                "avatar_stream_url": avatar_stream_url,
+            }
+            if segment_index is not None:
+                payload["segment_index"] = segment_index
+            await send(payload)
+            trace.mark("coach_response_sent")
+
+        async def stream_coach_segments(
+            transcript: str,
+            metrics_payload: dict,
+            session_context: dict,
+            trace: TurnTrace,
+        ) -> str:
+            # LLM sentences feed a queue; inline TTS for each sentence starts as soon
+            # as it is produced, while earlier sentences are still being delivered.
+            segments: asyncio.Queue[tuple[str, asyncio.Task | None] | None] = asyncio.Queue()
+            spoken: list[str] = []
+
+            async def produce() -> None:
+                try:
+                    async for sentence in coaching_engine.stream_coaching(
+                        transcription=transcript,
+                        speech_metrics=metrics_payload["speech_metrics"],
+                        visual_signals=metrics_payload["visual_signals"],
+                        session_context=session_context,
+                        trace=trace,
+                    ):
+                        spoken.append(sentence)
+                        audio_task = (
+                            None if tts_streaming else asyncio.create_task(avatar_manager.synthesize_speech(sentence))
+                        )
+                        segments.put_nowait((sentence, audio_task))
+                finally:
+                    segments.put_nowait(None)
+
+            producer = asyncio.create_task(produce())
+            try:
+                segment_index = 0
+                while (item := await segments.get()) is not None:
+                    sentence, audio_task = item
+                    await deliver_coach_segment(sentence, trace, audio_task, segment_index)
+                    segment_index += 1
+                await producer
+            finally:
+                producer.cancel()
+                while not segments.empty():
+                    item = segments.get_nowait()
+                    if item and item[1]:
+                        item[1].cancel()
+
+            return " ".join(spoken)
+
+        async def run_coach_response(
+            transcript: str,
+            metrics_payload: dict,
+            trace: TurnTrace,
+            draft_task: asyncio.Task | None = None,
+        ) -> None:
             try:
                 await send({"type": "status", "state": "coach_thinking"})
                 session_context = session_manager.session_context(session_id)
 
-                response_text = await coaching_engine.generate_coaching(
-                    transcription=transcript,
-                    speech_metrics=metrics_payload["speech_metrics"],
-                    visual_signals=metrics_payload["visual_signals"],
-                    session_context=session_context,
-                )
-
-                session_manager.record_feedback(session_id, response_text)
-
-                audio_base64, audio_mime = await avatar_manager.synthesize_speech(response_text)
-                if not avatar_stream_url:
-                    avatar_stream_url = await avatar_manager.prepare_avatar_stream(session_id)
+                draft = None
+                if draft_task:
+                    try:
+                        draft = await draft_task
+                    except asyncio.CancelledError:
+                        draft_task.cancel()
+                        raise
+                    except Exception:
+                        draft = None
+
+                if draft and coaching_engine.draft_is_current(draft):
+                    # The draft already holds the reply; the turn only waited on it here.
+                    trace.mark("llm_first_token")
+                    trace.mark("llm_complete")
+                    response_text = coaching_engine.commit_draft(draft, transcript)
+                    session_manager.record_feedback(session_id, response_text)
+                    await deliver_coach_segment(response_text, trace)
+                elif coach_segments:
+                    response_text = await stream_coach_segments(transcript, metrics_payload, session_context, trace)
+                    session_manager.record_feedback(session_id, response_text)
+                else:
+                    response_text = await coaching_engine.generate_coaching(
+                        transcription=transcript,
+                        speech_metrics=metrics_payload["speech_metrics"],
+                        visual_signals=metrics_payload["visual_signals"],
+                        session_context=session_context,
+                        trace=trace,
+                    )
+                    session_manager.record_feedback(session_id, response_text)
+                    await deliver_coach_segment(response_text, trace)
 
-                await send(
-                    {
-                        "type": "coach_response",
-                        "response_text": response_text,
-                        "audio_base64": audio_base64,
-                        "audio_mime_type": audio_mime,
-                        "avatar_stream_url": avatar_stream_url,
-                    }
-                )
                 await send({"type": "status", "state": "coach_ready"})
+                schedule_checkpoint()
             except asyncio.CancelledError:
                 await send({"type": "status", "state": "coach_interrupted"})
                 raise
             except Exception as error:
                 await send({"type": "error", "message": f"Coach response failed: {error}"})
 
+        coach_scheduler = CoachScheduler(
+            run=lambda trigger: run_coach_response(
+                trigger.transcript, trigger.metrics_payload, trigger.trace, trigger.draft_task
+            ),
+            min_run_seconds=config.coach_min_run_seconds,
+            last_committed=lambda: coaching_engine.last_coaching_time,
+        )
+
+        def maybe_speculate() -> None:
+            # A pause close to the next coaching slot: draft from the latest partial
+            # so the LLM runs while STT is still committing the final transcript.
+            if not config.coach_speculation or speculator.active or not latest_partial:
+                return
+            if coach_scheduler.busy or not coaching_engine.should_speculate(time.time()):
+                return
+            transcript, metrics_payload = latest_partial
+            speculator.start(
+                transcript,
+                coaching_engine.draft_coaching(
+                    transcription=transcript,
+                    speech_metrics=metrics_payload["speech_metrics"],
+                    visual_signals=metrics_payload["visual_signals"],
+                    session_context=metrics_payload["session_context"],
+                ),
+            )
+
         async def on_transcript(transcription: str, is_final: bool, timestamp: float) -> None:
-            nonlocal last_final_transcript, last_final_timestamp
+            nonlocal last_final_transcript, last_final_timestamp, latest_partial
             session = session_manager.get(session_id)
             if not session or session.paused:
                 return
@@ -338,8 +568,11 @@ def create_app() -> FastAPI:
                 last_final_transcript = normalized
                 last_final_timestamp = timestamp
 
+            trace = tracer.utterance()
+            trace.mark("stt_final" if is_final else "stt_partial")
+
             speech_metrics = speech_analyzer.process_transcription(transcription, timestamp, is_final)
-            visual_signals = visual_analyzer.get_current_signals()
+            visual_signals = visual_analyzer.get_current_signals(time.time())
 
             await send(
                 {
@@ -360,16 +593,15 @@ def create_app() -> FastAPI:
             metrics_payload["session_context"]["improvement_trend"] = trend
             session_manager.update_trend(session_id, trend)
             session_manager.record_metrics(session_id, metrics_payload)
-
-            await send(
-                {
-                    "type": "metrics",
-                    "data": metrics_payload,
-                }
-            )
+            metrics_publisher.publish(metrics_payload)
 
             if is_final:
+                trace.mark("metrics_computed")
                 session_manager.append_transcript(session_id, transcription)
+                schedule_checkpoint()
+                latest_partial = None
+            elif transcription.strip():
+                latest_partial = (transcription, metrics_payload)
 
             should_coach = coaching_engine.should_coach_now(
                 current_time=timestamp,
@@ -377,11 +609,22 @@ def create_app() -> FastAPI:
                 visual_signals=visual_signals,
                 is_final_transcript=is_final,
             )
+            if is_final:
+                trace.mark("should_coach")
+                tracer.end_utterance()
+
+            draft_task = None
+            if is_final and speculator.active:
+                draft_task = speculator.resolve(transcription)
+                # A matching draft was started for this slot, so use it even if the
+                # interval has a moment left to run.
+                should_coach = should_coach or draft_task is not None
 
             if should_coach and transcription.strip():
-                await session_manager.cancel_active_response(session_id)
-                task = asyncio.create_task(run_coach_response(transcription, metrics_payload))
-                session_manager.set_active_response_task(session_id, task)
+                priority = URGENT if coaching_engine.urgent_signal(speech_metrics, visual_signals) else ROUTINE
+                coach_scheduler.submit(CoachTrigger(transcription, metrics_payload, priority, draft_task, trace))
+            elif draft_task:
+                draft_task.cancel()
 
         async def on_stt_error(message: str) -> None:
             await send({"type": "error", "message": f"STT error: {message}"})
@@ -392,15 +635,88 @@ def create_app() -> FastAPI:
             on_error=on_stt_error,
             model_id=config.elevenlabs_stt_model,
             commit_strategy=config.elevenlabs_stt_commit_strategy,
+            language_code=config.stt_language,
+            max_buffer_seconds=config.stt_max_buffer_seconds,
+            replay_seconds=config.stt_replay_seconds,
+            chunk_ms=config.stt_chunk_ms,
+            max_delay_ms=config.stt_chunk_max_delay_ms,
+            endpoint=config.elevenlabs_stt_url,
+            pool=stt_pool,
+        )
+        telemetry_handle = telemetry.open_session(
+            {
+                "stt": stt_client.stats,
+                "coach_scheduler": lambda: {
+                    **coach_scheduler.stats(),
+                    "busy": int(coach_scheduler.busy),
+                    "pending": int(coach_scheduler.pending is not None),
+                },
+                "llm": lambda: coaching_engine.usage,
+                "speculation": speculator.stats,
+            }
         )
         stt_speaking = False
         stt_last_voice_at = 0.0
         stt_speech_rms_threshold = 0.035
         stt_silence_commit_delay = 0.8
+        stt_speculation_pause = 0.3
+        binary_audio = False
+        # With manual commits the server decides end-of-speech from the PCM itself
+        # instead of trusting the client-reported RMS. Upstream VAD needs the
+        # silence, so gating is skipped in that mode.
+        vad = (
+            VoiceActivityDetector(hangover_ms=config.vad_hangover_ms)
+            if config.server_vad and VoiceActivityDetector.available() and stt_client.commit_strategy == "manual"
+            else None
+        )
+
+        async def handle_audio(audio_bytes: bytes | memoryview, sample_rate: int, rms: float) -> None:
+            started = time.perf_counter()
+            await route_audio(audio_bytes, sample_rate, rms, started)
+            telemetry.observe("audio_ingress", time.perf_counter() - started)
+
+        async def route_audio(audio_bytes: bytes | memoryview, sample_rate: int, rms: float, received_at: float) -> None:
+            nonlocal stt_speaking, stt_last_voice_at
+            now = time.time()
+            decision = vad.process(audio_bytes, sample_rate) if (vad and audio_bytes) else None
+            if decision:
+                rms = decision.rms
+            voiced = decision.speaking if decision else rms >= stt_speech_rms_threshold
+            if voiced:
+                # The turn clock starts at the first voiced chunk of the utterance.
+                tracer.utterance().mark("audio_ingress", received_at)
+            speech_analyzer.ingest_audio(rms, now)
+            metrics_publisher.mark_dirty()
+
+            if not audio_bytes or not stt_client.enabled:
+                return
+
+            if decision:
+                for chunk in decision.forward:
+                    await stt_client.send_audio(chunk, sample_rate=sample_rate)
+                if decision.end_of_speech:
+                    maybe_speculate()
+                    await stt_client.commit(sample_rate=sample_rate)
+                return
+
+            await stt_client.send_audio(audio_bytes, sample_rate=sample_rate)
+
+            if rms >= stt_speech_rms_threshold:
+                stt_speaking = True
+                stt_last_voice_at = now
+            elif stt_speaking and now - stt_last_voice_at >= stt_silence_commit_delay:
+                await stt_client.commit(sample_rate=sample_rate)
+                stt_speaking = False
+            elif stt_speaking and now - stt_last_voice_at >= stt_speculation_pause:
+                maybe_speculate()
 
         try:
+            start_avatar_setup()
+            metrics_publisher.start()
             await stt_client.connect()
-            await send({"type": "status", "state": "connected"})
+            await send(
+                {"type": "status", "state": "connected", "protocol": codec.name, "resumed": bool(saved_state)}
+            )
             if not stt_client.enabled:
                 await send(
                     {
@@ -410,11 +726,48 @@ def create_app() -> FastAPI:
                 )
 
             while True:
-                raw = await websocket.receive_text()
-                message = json.loads(raw)
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+
+                raw_bytes = frame.get("bytes")
+                if raw_bytes is not None:
+                    if raw_bytes[:1] == bytes((FRAME_KIND_AUDIO,)):
+                        # Binary audio frames are raw PCM with a small header; the payload
+                        # is handed to the STT client as a memoryview without decoding.
+                        audio_frame = parse_audio_frame(raw_bytes) if binary_audio else None
+                        if audio_frame:
+                            await handle_audio(audio_frame.pcm, audio_frame.sample_rate, audio_frame.rms)
+                        continue
+                    if not codec.binary:
+                        continue
+                    message = codec.decode(raw_bytes)
+                else:
+                    message = fast_loads(frame.get("text") or "{}")
                 message_type = message.get("type")
 
+                if message_type == "configure":
+                    binary_audio = message.get("audio_transport") == "binary"
+                    tts_streaming = message.get("tts_transport") == "stream"
+                    coach_segments = bool(message.get("coach_segments", config.coach_streaming))
+                    metrics_publisher.delta = bool(message.get("metrics_delta", False))
+                    requested_format = str(message.get("tts_format", "mp3"))
+                    tts_format = requested_format if requested_format in TTS_OUTPUT_FORMATS else "mp3"
+                    await send(
+                        {
+                            "type": "status",
+                            "state": "configured",
+                            "audio_transport": "binary" if binary_audio else "json",
+                            "tts_transport": "stream" if tts_streaming else "inline",
+                            "tts_format": tts_format,
+                            "metrics_delta": metrics_publisher.delta,
+                            "coach_segments": coach_segments,
+                        }
+                    )
+                    continue
+
                 if message_type == "start_session":
+                    start_avatar_setup()
                     exercise = message.get("exercise_type", "free_talk")
                     session_manager.set_exercise(session_id, str(exercise))
                     await send({"type": "status", "state": "session_started"})
@@ -437,7 +790,8 @@ def create_app() -> FastAPI:
                     continue
 
                 if message_type == "user_interrupt":
-                    interrupted = await session_manager.cancel_active_response(session_id)
+                    speculator.discard()
+                    interrupted = await coach_scheduler.cancel()
                     if interrupted:
                         await send({"type": "status", "state": "coach_interrupted"})
                     continue
@@ -445,36 +799,26 @@ def create_app() -> FastAPI:
                 if message_type == "visual_signal":
                     payload = message.get("payload", {})
                     visual_analyzer.ingest_signal(payload, time.time())
+                    metrics_publisher.mark_dirty()
                     continue
 
                 if message_type == "audio_chunk":
                     chunk_b64 = message.get("chunk")
                     rms = float(message.get("rms", 0))
                     sample_rate = int(message.get("sample_rate", 16000) or 16000)
-                    now = time.time()
-                    speech_analyzer.process_transcription("", time.time(), False, rms=rms)
 
-                    if not chunk_b64 or not stt_client.enabled:
-                        continue
-
-                    try:
-                        audio_bytes = base64.b64decode(chunk_b64)
-                    except Exception:
-                        continue
-
-                    await stt_client.send_audio(audio_bytes, sample_rate=sample_rate)
+                    audio_bytes = b""
+                    if chunk_b64 and stt_client.enabled:
+                        with contextlib.suppress(Exception):
+                            audio_bytes = base64.b64decode(chunk_b64)
 
-                    if rms >= stt_speech_rms_threshold:
-                        stt_speaking = True
-                        stt_last_voice_at = now
-                    elif stt_speaking and now - stt_last_voice_at >= stt_silence_commit_delay:
-                        await stt_client.commit(sample_rate=sample_rate)
-                        stt_speaking = False
+                    await handle_audio(audio_bytes, sample_rate, rms)
                     continue
 
                 if message_type == "end_session":
                     with contextlib.suppress(Exception):
                         await stt_client.commit()
+                    session_ended = True
                     break
 
         except WebSocketDisconnect:
@@ -484,13 +828,34 @@ def create_app() -> FastAPI:
                 await send({"type": "error", "message": str(error)})
         finally:
             with contextlib.suppress(Exception):
-                await session_manager.cancel_active_response(session_id)
+                await metrics_publisher.aclose()
+            with contextlib.suppress(Exception):
+                await coach_scheduler.cancel()
+            speculator.discard()
             with contextlib.suppress(Exception):
                 await stt_client.close()
-
-            summary = session_manager.finish(session_id, summary="Session ended")
+            if avatar_task and not avatar_task.done():
+                avatar_task.cancel()
+            telemetry.close_session(telemetry_handle)
             with contextlib.suppress(Exception):
-                await send({"type": "session_summary", "summary": summary})
+                if checkpoint_task:
+                    await checkpoint_task
+                if session_ended:
+                    await session_manager.discard_state(session_id)
+                else:
+                    await save_session_state()
+
+            if session_ended:
+                summary = session_manager.finish(session_id, summary="Session ended")
+                summary["llm_usage"] = dict(coaching_engine.usage)
+                summary["speculation"] = speculator.stats()
+                summary["coach_scheduler"] = coach_scheduler.stats()
+                summary["stt"] = stt_client.stats()
+                summary["stage_latency"] = tracer.summary()
+                with contextlib.suppress(Exception):
+                    await send({"type": "session_summary", "summary": summary})
+            else:
+                session_manager.suspend(session_id)
             with contextlib.suppress(Exception):
                 await websocket.close()
 
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+# Binary websocket frames start with a one-byte kind so they can never be
+# confused with a text JSON message. Audio ingress frames carry a fixed
+# 12-byte header followed by raw little-endian PCM16:
+#
+#   offset 0  uint8    kind (FRAME_KIND_AUDIO)
+#   offset 1  3 bytes  reserved, must be zero
+#   offset 4  uint32   sample rate in Hz
+#   offset 8  float32  client-side RMS in [0, 1]
+#
+# The header is a multiple of two bytes so the PCM payload stays aligned for
+# int16 views without copying.
+FRAME_KIND_AUDIO = 0x01
+AUDIO_FRAME_HEADER = struct.Struct("<B3xIf")
+
+
+@dataclass(frozen=True)
+class AudioFrame:
+    sample_rate: int
+    rms: float
+    pcm: memoryview
+
+
+def parse_audio_frame(data: bytes | bytearray | memoryview) -> AudioFrame | None:
+    """Split a binary audio frame into header fields and a zero-copy PCM view."""
+    view = memoryview(data)
+    if len(view) < AUDIO_FRAME_HEADER.size or view[0] != FRAME_KIND_AUDIO:
+        return None
+
+    _, sample_rate, rms = AUDIO_FRAME_HEADER.unpack_from(view)
+    if sample_rate <= 0:
+        return None
+
+    return AudioFrame(
+        sample_rate=sample_rate,
+        rms=rms if rms == rms else 0.0,
+        pcm=view[AUDIO_FRAME_HEADER.size :],
+    )
+
+
+def pack_audio_frame(pcm: bytes, sample_rate: int = 16000, rms: float = 0.0) -> bytes:
+    return AUDIO_FRAME_HEADER.pack(FRAME_KIND_AUDIO, sample_rate, rms) + pcm
+
+
+# Outbound TTS audio is streamed as binary frames with an 8-byte header:
+#
+#   offset 0  uint8   kind (FRAME_KIND_TTS)
+#   offset 1  uint8   flags (TTS_FLAG_*)
+#   offset 2  uint16  stream id, announced in the matching coach_response message
+#   offset 4  uint32  sequence number, starting at 0
+#
+# The last frame of a stream carries TTS_FLAG_END and may have an empty payload.
+FRAME_KIND_TTS = 0x02
+TTS_FRAME_HEADER = struct.Struct("<BBHI")
+TTS_FLAG_END = 0x01
+TTS_FLAG_ERROR = 0x02
+TTS_FLAG_CANCELLED = 0x04
+
+
+def pack_tts_frame(stream_id: int, sequence: int, payload: bytes = b"", flags: int = 0) -> bytes:
+    return TTS_FRAME_HEADER.pack(FRAME_KIND_TTS, flags, stream_id & 0xFFFF, sequence) + payload
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass
-from typing import Any
+import contextlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterable
 
 import httpx
 
+from .http_pool import UpstreamHTTPPool
+from .simli_tokens import SimliTokenPool
+from .tts_cache import TTSCache
+
+# Client-facing format name -> (ElevenLabs output_format, MIME type).
+TTS_OUTPUT_FORMATS: dict[str, tuple[str, str]] = {
+    "mp3": ("mp3_44100_128", "audio/mpeg"),
+    "pcm": ("pcm_16000", "audio/pcm;rate=16000"),
+    "opus": ("opus_48000_64", "audio/ogg;codecs=opus"),
+}
+
 
 @dataclass
 class AvatarManager:
@@ -16,35 +28,130 @@ class AvatarManager:
     simli_face_id: str | None
     eleven_voice_id: str = "pNInz6obpgDQGcFmaJgB"
     eleven_model: str = "eleven_turbo_v2"
+    eleven_voice_settings: dict[str, float] = field(
+        default_factory=lambda: {"stability": 0.5, "similarity_boost": 0.7}
+    )
+    http_pool: UpstreamHTTPPool | None = None
+    tts_cache: TTSCache | None = None
+    simli_tokens: SimliTokenPool | None = None
+    elevenlabs_base_url: str = "https://api.elevenlabs.io"
+    simli_base_url: str = "https://api.simli.ai"
 
-    async def synthesize_speech(self, text: str) -> tuple[str | None, str | None]:
-        if not text.strip() or not self.elevenlabs_api_key:
-            return None, None
+    @contextlib.asynccontextmanager
+    async def _client(self, base_url: str) -> AsyncIterator[httpx.AsyncClient]:
+        if self.http_pool:
+            yield self.http_pool.client(base_url)
+            return
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            yield client
+
+    def _timeout(self, seconds: float) -> httpx.Timeout:
+        """Per-request timeout that keeps the pool's shorter connect timeout."""
+        connect = self.http_pool.connect_timeout if self.http_pool else seconds
+        return httpx.Timeout(seconds, connect=connect)
 
-        endpoint = f"https://api.elevenlabs.io/v1/text-to-speech/{self.eleven_voice_id}/stream"
+    def _tts_request(self, text: str, audio_format: str) -> tuple[str, dict[str, str], dict[str, Any], dict[str, str]]:
+        output_format, mime_type = TTS_OUTPUT_FORMATS.get(audio_format, TTS_OUTPUT_FORMATS["mp3"])
+        endpoint = f"/v1/text-to-speech/{self.eleven_voice_id}/stream"
         payload = {
             "text": text,
             "model_id": self.eleven_model,
-            "voice_settings": {"stability": 0.5, "similarity_boost": 0.7},
+            "voice_settings": self.eleven_voice_settings,
         }
 
         headers = {
-            "xi-api-key": self.elevenlabs_api_key,
+            "xi-api-key": self.elevenlabs_api_key or "",
             "Content-Type": "application/json",
-            "Accept": "audio/mpeg",
+            "Accept": mime_type.split(";")[0],
         }
+        return endpoint, headers, payload, {"output_format": output_format}
+
+    def _cache_key(self, text: str, audio_format: str) -> str | None:
+        if not self.tts_cache or not self.tts_cache.cacheable(text):
+            return None
+        output_format = TTS_OUTPUT_FORMATS.get(audio_format, TTS_OUTPUT_FORMATS["mp3"])[0]
+        return self.tts_cache.key(text, self.eleven_voice_id, self.eleven_model, self.eleven_voice_settings, output_format)
+
+    async def speech_bytes(self, text: str, audio_format: str = "mp3") -> bytes | None:
+        if not text.strip() or not self.elevenlabs_api_key:
+            return None
+
+        cache_key = self._cache_key(text, audio_format)
+        if cache_key:
+            cached = await self.tts_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        endpoint, headers, payload, params = self._tts_request(text, audio_format)
 
         try:
-            async with httpx.AsyncClient(timeout=40) as client:
-                response = await client.post(endpoint, headers=headers, json=payload)
+            async with self._client(self.elevenlabs_base_url) as client:
+                response = await client.post(endpoint, headers=headers, json=payload, params=params, timeout=self._timeout(40))
                 response.raise_for_status()
                 audio_bytes = response.content
         except Exception:
-            return None, None
+            return None
 
+        if cache_key:
+            await self.tts_cache.put(cache_key, audio_bytes)
+        return audio_bytes
+
+    async def synthesize_speech(self, text: str) -> tuple[str | None, str | None]:
+        audio_bytes = await self.speech_bytes(text, "mp3")
+        if not audio_bytes:
+            return None, None
         return base64.b64encode(audio_bytes).decode("ascii"), "audio/mpeg"
 
-    async def create_simli_token(self, session_id: str) -> dict[str, Any] | None:
+    async def stream_speech(self, text: str, audio_format: str = "mp3") -> AsyncIterator[bytes]:
+        """Yield TTS audio bytes as ElevenLabs produces them.
+
+        Unlike ``synthesize_speech`` this raises on upstream errors so the caller
+        can terminate the client-side stream explicitly.
+        """
+        if not text.strip() or not self.elevenlabs_api_key:
+            return
+
+        cache_key = self._cache_key(text, audio_format)
+        if cache_key:
+            cached = await self.tts_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        endpoint, headers, payload, params = self._tts_request(text, audio_format)
+        received = bytearray() if cache_key else None
+
+        async with self._client(self.elevenlabs_base_url) as client:
+            async with client.stream(
+                "POST", endpoint, headers=headers, json=payload, params=params, timeout=self._timeout(40)
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    if chunk:
+                        if received is not None:
+                            received += chunk
+                        yield chunk
+
+        if cache_key and received:
+            await self.tts_cache.put(cache_key, bytes(received))
+
+    async def prewarm(self, phrases: Iterable[str], audio_formats: Iterable[str] = ("mp3",)) -> int:
+        """Synthesize canned phrases into the cache ahead of the first session."""
+        if not self.tts_cache or not self.elevenlabs_api_key:
+            return 0
+
+        warmed = 0
+        for audio_format in audio_formats:
+            for phrase in phrases:
+                if await self.speech_bytes(phrase, audio_format):
+                    warmed += 1
+        return warmed
+
+    @staticmethod
+    def tts_mime_type(audio_format: str) -> str:
+        return TTS_OUTPUT_FORMATS.get(audio_format, TTS_OUTPUT_FORMATS["mp3"])[1]
+
+    async def create_simli_token(self, session_id: str | None) -> dict[str, Any] | None:
         if not self.simli_api_key:
             return None
 
@@ -53,20 +160,22 @@ class AvatarManager:
             "api-key": self.simli_api_key,
         }
 
+        # Pooled tokens are minted before any session exists, so they carry no sessionId.
+        metadata = {"faceId": self.simli_face_id}
+        if session_id:
+            metadata["sessionId"] = session_id
         payload = {
             "simliAPIKey": self.simli_api_key,
-            "metadata": {
-                "sessionId": session_id,
-                "faceId": self.simli_face_id,
-            },
+            "metadata": metadata,
         }
 
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
+            async with self._client(self.simli_base_url) as client:
                 response = await client.post(
-                    "https://api.simli.ai/compose/token",
+                    "/compose/token",
                     headers=headers,
                     json=payload,
+                    timeout=self._timeout(20),
                 )
                 response.raise_for_status()
                 return response.json()
@@ -74,7 +183,9 @@ class AvatarManager:
             return None
 
     async def prepare_avatar_stream(self, session_id: str) -> str | None:
-        token_payload = await self.create_simli_token(session_id)
+        token_payload = self.simli_tokens.take() if self.simli_tokens else None
+        if not token_payload:
+            token_payload = await self.create_simli_token(session_id)
         if not token_payload:
             return None
         room_url = token_payload.get("roomUrl")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from .telemetry import TurnTrace
+
+ROUTINE = 0
+URGENT = 1
+
+
+@dataclass
+class CoachTrigger:
+    transcript: str
+    metrics_payload: dict
+    priority: int = ROUTINE
+    draft_task: asyncio.Task | None = None
+    trace: TurnTrace = field(default_factory=TurnTrace)
+    submitted_at: float = field(default_factory=time.time)
+
+    def discard(self) -> None:
+        if self.draft_task:
+            self.draft_task.cancel()
+
+
+@dataclass
+class CoachScheduler:
+    """Single-flight runner for a session's coach responses.
+
+    Only one response runs at a time. Triggers that arrive meanwhile are
+    coalesced into a single pending one (the newest wins, keeping the highest
+    priority). A running response is only cancelled for an urgent trigger,
+    and never before it has had ``min_run_seconds`` to make progress. When a
+    response completes, a pending urgent trigger runs next; a pending routine
+    one is dropped since the coach has just spoken. So is an urgent one
+    submitted before ``last_committed()``: it was decided against the previous
+    coaching time and the response that just finished already covered it.
+    """
+
+    run: Callable[[CoachTrigger], Awaitable[None]]
+    last_committed: Callable[[], float] | None = None
+    min_run_seconds: float = 2.0
+    started: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    preempted: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+
+    def __post_init__(self) -> None:
+        self.current: CoachTrigger | None = None
+        self.pending: CoachTrigger | None = None
+        self._task: asyncio.Task | None = None
+        self._started_at = 0.0
+        self._preempt_handle: asyncio.TimerHandle | None = None
+        self._preempting = False
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, trigger: CoachTrigger) -> None:
+        if not self.busy:
+            self._start(trigger)
+            return
+
+        if self.pending:
+            trigger.priority = max(trigger.priority, self.pending.priority)
+            self.pending.discard()
+            self.coalesced += 1
+        self.pending = trigger
+
+        if self.current and trigger.priority > self.current.priority:
+            self._schedule_preempt()
+
+    def _start(self, trigger: CoachTrigger) -> None:
+        self.current = trigger
+        self.started += 1
+        self._started_at = asyncio.get_running_loop().time()
+        self._task = asyncio.create_task(self.run(trigger))
+        self._task.add_done_callback(self._on_done)
+
+    def _schedule_preempt(self) -> None:
+        if self._preempt_handle:
+            return
+        loop = asyncio.get_running_loop()
+        delay = self.min_run_seconds - (loop.time() - self._started_at)
+        if delay <= 0:
+            self._preempt()
+        else:
+            self._preempt_handle = loop.call_later(delay, self._preempt)
+
+    def _preempt(self) -> None:
+        self._preempt_handle = None
+        if self.busy and self.current and self.pending and self.pending.priority > self.current.priority:
+            self._preempting = True
+            self._task.cancel()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if task is not self._task:
+            return
+        if self._preempt_handle:
+            self._preempt_handle.cancel()
+            self._preempt_handle = None
+
+        preempted, self._preempting = self._preempting, False
+        if task.cancelled():
+            self.cancelled += 1
+            self.preempted += int(preempted)
+        else:
+            self.completed += 1
+        self._task = None
+        self.current = None
+
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return
+        stale = self.last_committed is not None and pending.submitted_at < self.last_committed()
+        if preempted or (pending.priority >= URGENT and not stale):
+            self._start(pending)
+        else:
+            pending.discard()
+            self.dropped += 1
+
+    async def cancel(self) -> bool:
+        """Cancel the running response and forget pending triggers."""
+        if self.pending:
+            self.pending.discard()
+            self.pending = None
+        if not self.busy:
+            return False
+
+        task = self._task
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "preempted": self.preempted,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
+
+from .session_digest import CHARS_PER_TOKEN, SessionDigest, estimate_message_tokens, estimate_tokens
+from .telemetry import TurnTrace
 
 try:
     from anthropic import AsyncAnthropic
@@ -11,6 +16,55 @@ except ImportError:  # pragma: no cover - optional dependency during bootstrap
     AsyncAnthropic = None  # type: ignore
 
 
+FALLBACK_RESPONSES: dict[str, str] = {
+    "filler": "Good momentum. Slow down slightly and replace each um with a one-second pause before your next key point.",
+    "eye_contact": "Your ideas are strong. Keep your gaze on the camera for your next two sentences to project more confidence.",
+    "too_fast": "Nice energy. Drop your pace by about 15 percent and land each sentence ending before the next thought.",
+    "too_slow": "You sound thoughtful. Add a little more pace and connect your points with shorter transitions to keep momentum.",
+    "default": "Great control so far. Now raise the bar by using one deliberate pause before your main message.",
+}
+
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+@dataclass
+class SentenceSplitter:
+    """Cuts streamed model text into sentences that are worth a TTS request."""
+
+    min_chars: int = 24
+    buffer: str = ""
+
+    def feed(self, text: str) -> list[str]:
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start : match.end()].strip()
+            if len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        remainder = self.buffer.strip()
+        self.buffer = ""
+        return remainder
+
+
+@dataclass
+class CoachDraft:
+    """A coaching response generated ahead of the final transcript."""
+
+    transcription: str
+    speech_metrics: dict
+    visual_signals: dict
+    session_context: dict
+    turn: int
+    response_text: str = ""
+
+
 @dataclass
 class CoachingEngine:
     """Generates contextual live coaching responses."""
@@ -22,10 +76,55 @@ class CoachingEngine:
     last_coaching_time: float = 0.0
     conversation_history: list[dict[str, str]] = field(default_factory=list)
     feedback_given: list[str] = field(default_factory=list)
-    running_summary: str = ""
+    digest: SessionDigest = field(default_factory=SessionDigest)
+    session_summary: str = ""
+    prompt_caching: bool = True
+    max_input_tokens: int = 6000
+    compact_to: float = 0.5
+    max_transcript_tokens: int = 600
+    speculation_lead: float = 3.0
+    turns_committed: int = 0
+    usage: dict[str, int] = field(
+        default_factory=lambda: {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "compactions": 0,
+            "cancelled_requests": 0,
+            "wasted_tokens": 0,
+        }
+    )
 
     def __post_init__(self) -> None:
+        # Usage from earlier connections of a resumed session; ``usage`` counts this one only.
+        self.restored_usage: dict[str, int] = {}
         self.client = AsyncAnthropic(api_key=self.api_key) if (AsyncAnthropic and self.api_key) else None
+        self._message_tokens = [estimate_message_tokens(item) for item in self.conversation_history]
+
+    def snapshot(self) -> dict:
+        """Conversation state needed to continue the session in another process."""
+        return {
+            "last_coaching_time": self.last_coaching_time,
+            "conversation_history": self.conversation_history,
+            "feedback_given": self.feedback_given,
+            "digest": self.digest.snapshot(),
+            "session_summary": self.session_summary,
+            "turns_committed": self.turns_committed,
+            "usage": {key: self.restored_usage.get(key, 0) + value for key, value in self.usage.items()},
+        }
+
+    def restore(self, state: dict) -> None:
+        self.last_coaching_time = state["last_coaching_time"]
+        self.conversation_history = list(state["conversation_history"])
+        self._message_tokens = [estimate_message_tokens(item) for item in self.conversation_history]
+        self.feedback_given = list(state["feedback_given"])
+        self.digest.restore(state["digest"])
+        self.session_summary = state["session_summary"]
+        self.turns_committed = state["turns_committed"]
+        # Kept apart so per-connection counters are not exported twice.
+        self.restored_usage = dict(state["usage"])
 
     def should_coach_now(
         self,
@@ -44,46 +143,109 @@ class CoachingEngine:
         if (not is_final_transcript) and time_since_last > self.coaching_interval and total_words >= 8:
             return True
 
-        urgent_signal = False
+        if self.urgent_signal(speech_metrics, visual_signals) and time_since_last > 4:
+            return True
+
+        return False
+
+    @staticmethod
+    def urgent_signal(speech_metrics: dict, visual_signals: dict) -> bool:
         if speech_metrics.get("filler_word_rate", 0) > 6:
-            urgent_signal = True
+            return True
 
         if visual_signals.get("eye_contact_percentage", 100) < 30:
-            urgent_signal = True
+            return True
 
         wpm = speech_metrics.get("words_per_minute", 130)
         if wpm > 180 or (0 < wpm < 100):
-            urgent_signal = True
-
-        if speech_metrics.get("longest_pause_seconds", 0) > 5:
-            urgent_signal = True
-
-        if urgent_signal and time_since_last > 4:
             return True
 
-        return False
+        return speech_metrics.get("longest_pause_seconds", 0) > 5
+
+    def should_speculate(self, current_time: float) -> bool:
+        """Whether a pause now is close enough to the next coaching slot to draft ahead."""
+        return current_time - self.last_coaching_time > self.coaching_interval - self.speculation_lead
 
     def _trim_history(self) -> None:
-        if len(self.conversation_history) <= 40:
+        """Fold old turns into the session digest when the request outgrows its token budget.
+
+        History is cut in one step down to ``compact_to`` of the budget, so the
+        prefix stays byte-identical, and cacheable, for the turns until the next
+        compaction. The rendered digest travels as a second system block.
+        """
+        summary_tokens = estimate_tokens(self.session_summary) if self.session_summary else 0
+        budget = self.max_input_tokens - estimate_tokens(self.system_prompt) - summary_tokens
+        if sum(self._message_tokens) <= budget:
             return
 
-        older = self.conversation_history[:-20]
-        older_text = " ".join(item.get("content", "")[:200] for item in older)
+        self.session_summary = self.digest.render()
+        budget = self.max_input_tokens - estimate_tokens(self.system_prompt) - estimate_tokens(self.session_summary)
+        target = int(budget * self.compact_to)
 
-        snippet = older_text.strip()
-        if snippet:
-            merged = f"{self.running_summary} {snippet}".strip()
-            self.running_summary = merged[-6000:]
+        kept = 0
+        tokens = 0
+        for cost in reversed(self._message_tokens):
+            if kept and tokens + cost > target:
+                break
+            tokens += cost
+            kept += 1
 
-        summary_message = {
-            "role": "user",
-            "content": (
-                "Session summary so far (carry this context forward): "
-                f"{self.running_summary[-1200:]}"
-            ),
+        # Messages must open with a user turn; the newest message always is one.
+        start = len(self.conversation_history) - kept
+        while self.conversation_history[start]["role"] != "user":
+            start += 1
+        self.conversation_history = self.conversation_history[start:]
+        self._message_tokens = self._message_tokens[start:]
+        self.usage["compactions"] += 1
+
+    def _request_system(self) -> str | list[dict[str, Any]]:
+        if not self.prompt_caching:
+            if not self.session_summary:
+                return self.system_prompt
+            return f"{self.system_prompt}\n\n{self.session_summary}"
+
+        blocks = [{"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}]
+        if self.session_summary:
+            blocks.append({"type": "text", "text": self.session_summary, "cache_control": {"type": "ephemeral"}})
+        return blocks
+
+    def _request_messages(self, pending: dict[str, str] | None = None) -> list[dict[str, Any]]:
+        """Return history with a cache breakpoint on the last stable message.
+
+        Everything before the newest user turn is unchanged from the previous
+        request, so marking the message just before it lets the next turn read
+        the whole prefix from cache. ``pending`` is a user turn sent without
+        being added to history.
+        """
+        messages: list[dict[str, Any]] = list(self.conversation_history)
+        if pending:
+            messages.append(pending)
+        if not self.prompt_caching or len(messages) < 2:
+            return messages
+
+        stable = messages[-2]
+        messages[-2] = {
+            "role": stable["role"],
+            "content": [{"type": "text", "text": stable["content"], "cache_control": {"type": "ephemeral"}}],
         }
+        return messages
+
+    def _record_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+        self.usage["requests"] += 1
+        for key in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+            self.usage[key] += int(getattr(usage, key, 0) or 0)
 
-        self.conversation_history = [summary_message, *self.conversation_history[-20:]]
+    def _record_waste(self, pending: dict[str, str] | None = None, output_text: str = "") -> None:
+        """Count a request abandoned mid-flight; its tokens are estimated, not reported."""
+        self.usage["cancelled_requests"] += 1
+        tokens = estimate_tokens(self.system_prompt) + sum(self._message_tokens) + estimate_tokens(output_text)
+        if self.session_summary:
+            tokens += estimate_tokens(self.session_summary)
+        if pending:
+            tokens += estimate_message_tokens(pending)
+        self.usage["wasted_tokens"] += tokens
 
     @staticmethod
     def _response_text(blocks: list[Any]) -> str:
@@ -100,25 +262,26 @@ class CoachingEngine:
         eye_contact = visual_signals.get("eye_contact_percentage", 0)
 
         if filler_rate > 6:
-            return "Good momentum. Slow down slightly and replace each um with a one-second pause before your next key point."
+            return FALLBACK_RESPONSES["filler"]
         if eye_contact < 35:
-            return "Your ideas are strong. Keep your gaze on the camera for your next two sentences to project more confidence."
+            return FALLBACK_RESPONSES["eye_contact"]
         if wpm > 180:
-            return "Nice energy. Drop your pace by about 15 percent and land each sentence ending before the next thought."
+            return FALLBACK_RESPONSES["too_fast"]
         if 0 < wpm < 100:
-            return "You sound thoughtful. Add a little more pace and connect your points with shorter transitions to keep momentum."
+            return FALLBACK_RESPONSES["too_slow"]
 
-        return "Great control so far. Now raise the bar by using one deliberate pause before your main message."
+        return FALLBACK_RESPONSES["default"]
 
-    async def generate_coaching(
+    def _turn_message(
         self,
         transcription: str,
         speech_metrics: dict,
         visual_signals: dict,
         session_context: dict,
-    ) -> str:
+    ) -> dict[str, str]:
+        transcript_chars = int(self.max_transcript_tokens * CHARS_PER_TOKEN)
         payload = {
-            "transcription": transcription,
+            "transcription": transcription[-transcript_chars:],
             "speech_metrics": speech_metrics,
             "visual_signals": visual_signals,
             "session_context": {
@@ -134,33 +297,167 @@ class CoachingEngine:
             f"{json.dumps(payload, ensure_ascii=True)}\n\n"
             "Provide the next coaching response as live spoken guidance."
         )
+        return {"role": "user", "content": user_message}
 
-        self.conversation_history.append({"role": "user", "content": user_message})
+    def _begin_turn(
+        self,
+        transcription: str,
+        speech_metrics: dict,
+        visual_signals: dict,
+        session_context: dict,
+    ) -> None:
+        self.digest.observe_turn(speech_metrics, visual_signals, session_context)
+        self._append(self._turn_message(transcription, speech_metrics, visual_signals, session_context))
         self._trim_history()
 
+    def _append(self, message: dict[str, str]) -> None:
+        self.conversation_history.append(message)
+        self._message_tokens.append(estimate_message_tokens(message))
+
+    def _finish_turn(self, coach_response: str) -> None:
+        self.turns_committed += 1
+        self._append({"role": "assistant", "content": coach_response})
+        self.digest.observe_feedback(coach_response)
+        self.feedback_given.append(coach_response[:120])
+        self.feedback_given = self.feedback_given[-50:]
+        self.last_coaching_time = time.time()
+
+    async def generate_coaching(
+        self,
+        transcription: str,
+        speech_metrics: dict,
+        visual_signals: dict,
+        session_context: dict,
+        trace: TurnTrace | None = None,
+    ) -> str:
+        self._begin_turn(transcription, speech_metrics, visual_signals, session_context)
+
         if not self.client:
             coach_response = self._fallback_response(speech_metrics, visual_signals)
-            self.conversation_history.append({"role": "assistant", "content": coach_response})
-            self.feedback_given.append(coach_response[:120])
-            self.last_coaching_time = time.time()
+            self._finish_turn(coach_response)
             return coach_response
 
         try:
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=220,
-                system=self.system_prompt,
-                messages=self.conversation_history,
+                system=self._request_system(),
+                messages=self._request_messages(),
             )
+            if trace:
+                trace.mark("llm_first_token")
+                trace.mark("llm_complete")
+            self._record_usage(getattr(response, "usage", None))
             coach_response = self._response_text(response.content) or self._fallback_response(
                 speech_metrics, visual_signals
             )
+        except asyncio.CancelledError:
+            self._record_waste()
+            raise
         except Exception:
             coach_response = self._fallback_response(speech_metrics, visual_signals)
 
-        self.conversation_history.append({"role": "assistant", "content": coach_response})
-        self.feedback_given.append(coach_response[:120])
-        self.feedback_given = self.feedback_given[-50:]
-        self.last_coaching_time = time.time()
+        self._finish_turn(coach_response)
 
         return coach_response
+
+    async def draft_coaching(
+        self,
+        transcription: str,
+        speech_metrics: dict,
+        visual_signals: dict,
+        session_context: dict,
+    ) -> CoachDraft:
+        """Generate a response for a partial transcript without touching history.
+
+        The draft only becomes a coaching turn through ``commit_draft``.
+        """
+        draft = CoachDraft(transcription, speech_metrics, visual_signals, session_context, self.turns_committed)
+        if not self.client:
+            draft.response_text = self._fallback_response(speech_metrics, visual_signals)
+            return draft
+
+        pending = self._turn_message(transcription, speech_metrics, visual_signals, session_context)
+        try:
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=220,
+                system=self._request_system(),
+                messages=self._request_messages(pending),
+            )
+        except asyncio.CancelledError:
+            self._record_waste(pending)
+            raise
+        self._record_usage(getattr(response, "usage", None))
+        draft.response_text = self._response_text(response.content) or self._fallback_response(
+            speech_metrics, visual_signals
+        )
+        return draft
+
+    def draft_is_current(self, draft: CoachDraft) -> bool:
+        return draft.turn == self.turns_committed and bool(draft.response_text)
+
+    def commit_draft(self, draft: CoachDraft, transcription: str) -> str:
+        """Record a draft as the coaching turn for the final ``transcription``."""
+        self._begin_turn(transcription, draft.speech_metrics, draft.visual_signals, draft.session_context)
+        self._finish_turn(draft.response_text)
+        return draft.response_text
+
+    async def stream_coaching(
+        self,
+        transcription: str,
+        speech_metrics: dict,
+        visual_signals: dict,
+        session_context: dict,
+        trace: TurnTrace | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield the coaching response sentence by sentence as the model streams it.
+
+        History is only updated once the full response is known, so a cancelled
+        stream leaves no partial assistant turn behind.
+        """
+        self._begin_turn(transcription, speech_metrics, visual_signals, session_context)
+
+        if not self.client:
+            coach_response = self._fallback_response(speech_metrics, visual_signals)
+            self._finish_turn(coach_response)
+            yield coach_response
+            return
+
+        splitter = SentenceSplitter()
+        spoken: list[str] = []
+        try:
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=220,
+                system=self._request_system(),
+                messages=self._request_messages(),
+            ) as stream:
+                async for text in stream.text_stream:
+                    if trace:
+                        trace.mark("llm_first_token")
+                    for sentence in splitter.feed(text):
+                        spoken.append(sentence)
+                        yield sentence
+                final_message = await stream.get_final_message()
+                if trace:
+                    trace.mark("llm_complete")
+                self._record_usage(getattr(final_message, "usage", None))
+        except (asyncio.CancelledError, GeneratorExit):
+            self._record_waste(output_text=" ".join(spoken) + splitter.buffer)
+            raise
+        except Exception:
+            # Keep whatever was already spoken; only fall back if nothing was.
+            pass
+
+        remainder = splitter.flush()
+        if remainder:
+            spoken.append(remainder)
+            yield remainder
+
+        if not spoken:
+            fallback = self._fallback_response(speech_metrics, visual_signals)
+            spoken.append(fallback)
+            yield fallback
+
+        self._finish_turn(" ".join(spoken))
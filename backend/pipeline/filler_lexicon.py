@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# Letters with optional inner apostrophes ("don't", "l'idée"); digits are not words.
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+FILLER_LEXICONS: dict[str, tuple[str, ...]] = {
+    "en": (
+        "um",
+        "uh",
+        "uhh",
+        "umm",
+        "hmm",
+        "hm",
+        "like",
+        "you know",
+        "basically",
+        "actually",
+        "literally",
+        "right",
+        "so",
+        "well",
+        "i mean",
+        "kind of",
+        "sort of",
+        "stuff like that",
+    ),
+    "es": ("eh", "em", "este", "pues", "bueno", "o sea", "tipo", "en plan", "como que", "vale", "sabes"),
+    "fr": ("euh", "heu", "ben", "bah", "genre", "en fait", "du coup", "tu vois", "voilà", "bref", "quoi"),
+    "de": ("äh", "ähm", "hm", "also", "halt", "quasi", "sozusagen", "irgendwie", "eigentlich", "weißt du"),
+    "pt": ("ãh", "hum", "tipo", "então", "né", "assim", "quer dizer", "sabe", "bem"),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def register_lexicon(language: str, terms: list[str] | tuple[str, ...]) -> None:
+    FILLER_LEXICONS[language.lower()] = tuple(term.strip().lower() for term in terms if term.strip())
+    matcher_for_language.cache_clear()
+
+
+def load_lexicon_dir(directory: str | Path) -> list[str]:
+    """Register every ``<language>.json`` list of filler terms found in ``directory``."""
+    loaded = []
+    for path in sorted(Path(directory).glob("*.json")):
+        terms = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(terms, list):
+            register_lexicon(path.stem, [str(term) for term in terms])
+            loaded.append(path.stem.lower())
+    return loaded
+
+
+def lexicon_for(language: str) -> tuple[str, ...]:
+    language = language.lower()
+    if language in FILLER_LEXICONS:
+        return FILLER_LEXICONS[language]
+    base = language.replace("_", "-").split("-")[0]
+    return FILLER_LEXICONS.get(base, FILLER_LEXICONS["en"])
+
+
+class FillerMatcher:
+    """Counts single and multi-word filler terms in one pass over word tokens.
+
+    Terms are stored in a token trie. Each token position walks the trie at most
+    as deep as the longest term, so overlapping terms ("like" inside "stuff like
+    that") are all counted, as the per-term regexes used to do.
+    """
+
+    def __init__(self, terms: tuple[str, ...]) -> None:
+        self.terms = terms
+        self._trie: dict = {}
+        for term in terms:
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[None] = term
+
+    def scan(self, text: str) -> tuple[int, dict[str, int]]:
+        """Return the word count and per-term filler counts for ``text``."""
+        tokens = tokenize(text)
+        counts: dict[str, int] = {}
+        root = self._trie
+        token_count = len(tokens)
+
+        for start, token in enumerate(tokens):
+            node = root.get(token)
+            position = start + 1
+            while node is not None:
+                term = node.get(None)
+                if term is not None:
+                    counts[term] = counts.get(term, 0) + 1
+                if position >= token_count:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+        return token_count, counts
+
+
+@lru_cache(maxsize=32)
+def get_filler_matcher(terms: tuple[str, ...]) -> FillerMatcher:
+    return FillerMatcher(terms)
+
+
+@lru_cache(maxsize=32)
+def matcher_for_language(language: str) -> FillerMatcher:
+    return get_filler_matcher(lexicon_for(language))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass, field
+
+import httpx
+
+
+@dataclass
+class UpstreamHTTPPool:
+    """App-lifetime, keep-alive HTTP clients shared by every session.
+
+    One ``httpx.AsyncClient`` is kept per upstream origin so connection limits
+    apply per host and TLS sessions are reused across coaching turns.
+    """
+
+    max_connections_per_host: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
+    http2: bool = False
+    clients: dict[str, httpx.AsyncClient] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive.
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            self.http2 = False
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        existing = self.clients.get(base_url)
+        if existing and not existing.is_closed:
+            return existing
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections_per_host,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(40.0, connect=self.connect_timeout),
+        )
+        self.clients[base_url] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+
+def diff_payload(previous: dict, current: dict) -> dict:
+    """Return only the fields of ``current`` that differ from ``previous``.
+
+    Nested dicts are diffed recursively; keys that disappeared map to None.
+    """
+    changes: dict[str, Any] = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = diff_payload(old, value)
+            if nested:
+                changes[key] = nested
+        elif value != old:
+            changes[key] = value
+    for key in previous.keys() - current.keys():
+        changes[key] = None
+    return changes
+
+
+@dataclass
+class MetricsPublisher:
+    """Coalesces metrics updates and emits at most one frame per tick.
+
+    Producers either ``publish`` a ready payload or ``mark_dirty`` and let the
+    publisher ``build`` one at tick time. Unchanged payloads are skipped; in
+    delta mode only changed fields are sent after the first full frame.
+    ``sample``, if set, gets the payload the client is showing on every tick,
+    sent or not, so history is kept at the tick cadence.
+    """
+
+    send: Callable[[dict[str, Any]], Awaitable[None]]
+    build: Callable[[], dict]
+    sample: Callable[[dict], None] | None = None
+    interval: float = 0.25
+    delta: bool = False
+    frames_sent: int = 0
+    frames_skipped: int = 0
+
+    def __post_init__(self) -> None:
+        self._pending: dict | None = None
+        self._dirty = False
+        self._last_sent: dict | None = None
+        self._task: asyncio.Task | None = None
+
+    def publish(self, payload: dict) -> None:
+        self._pending = payload
+        self._dirty = True
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            with contextlib.suppress(Exception):
+                await self.flush()
+                if self.sample and self._last_sent is not None:
+                    self.sample(self._last_sent)
+
+    async def flush(self) -> None:
+        if not self._dirty:
+            return
+
+        payload = self._pending if self._pending is not None else self.build()
+        self._pending = None
+        self._dirty = False
+
+        if payload == self._last_sent:
+            self.frames_skipped += 1
+            return
+
+        if self.delta and self._last_sent is not None:
+            await self.send({"type": "metrics_delta", "data": diff_payload(self._last_sent, payload)})
+        else:
+            await self.send({"type": "metrics", "data": payload})
+        self._last_sent = payload
+        self.frames_sent += 1
+
+    async def aclose(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        # Close the history with the latest state, even if no tick has run yet.
+        if self.sample:
+            payload = self._pending if self._pending is not None else self.build() if self._dirty else self._last_sent
+            if payload is not None:
+                self.sample(payload)
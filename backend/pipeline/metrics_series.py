@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+
+SERIES_FIELDS: tuple[tuple[str, str, str], ...] = (
+    ("words_per_minute", "speech_metrics", "words_per_minute"),
+    ("filler_word_rate", "speech_metrics", "filler_word_rate"),
+    ("volume_consistency", "speech_metrics", "volume_consistency"),
+    ("eye_contact_percentage", "visual_signals", "eye_contact_percentage"),
+    ("posture_score", "visual_signals", "posture_score"),
+)
+
+# Blob layout: magic, name-list length, point count, interval, start time,
+# comma-separated field names, then one little-endian float32 column per field.
+BLOB_MAGIC = b"MTS1"
+BLOB_HEADER = struct.Struct("<4sHIdd")
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == "little":
+        return column.tobytes()
+    swapped = array("f", column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+@dataclass
+class MetricsTimeSeries:
+    """Bounded per-session metrics history sampled at a fixed cadence.
+
+    Samples are averaged into ``interval``-second buckets. When the series
+    reaches ``capacity`` points, adjacent buckets are merged and the interval
+    doubles, so memory stays fixed however long the session runs.
+    """
+
+    interval: float = 5.0
+    capacity: int = 240
+    started_at: float | None = None
+    columns: dict[str, array] = field(default_factory=lambda: {name: array("f") for name, _, _ in SERIES_FIELDS})
+    _bucket: int = 0
+    _sums: list[float] = field(default_factory=lambda: [0.0] * len(SERIES_FIELDS))
+    _count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.columns[SERIES_FIELDS[0][0]])
+
+    def record(self, timestamp: float, metrics: dict) -> None:
+        if self.started_at is None:
+            self.started_at = timestamp
+
+        bucket = int(max(0.0, timestamp - self.started_at) // self.interval)
+        if bucket != self._bucket and self._count:
+            self._close_bucket()
+            bucket = int(max(0.0, timestamp - self.started_at) // self.interval)
+        self._bucket = max(bucket, self._bucket)
+
+        for index, (_, group, key) in enumerate(SERIES_FIELDS):
+            value = metrics.get(group, {}).get(key, 0.0)
+            self._sums[index] += float(value or 0.0)
+        self._count += 1
+
+    def _close_bucket(self) -> None:
+        values = [total / self._count for total in self._sums]
+        index = self._bucket
+
+        while True:
+            if len(self) >= self.capacity:
+                self._downsample()
+                index //= 2
+                continue
+            if len(self) < index:
+                # Carry the last value forward across stretches with no samples.
+                for (name, _, _), value in zip(SERIES_FIELDS, values):
+                    column = self.columns[name]
+                    column.append(column[-1] if column else value)
+                continue
+            break
+
+        for (name, _, _), value in zip(SERIES_FIELDS, values):
+            column = self.columns[name]
+            if len(column) == index:
+                column.append(value)
+            else:
+                column[-1] = (column[-1] + value) / 2
+
+        self._sums = [0.0] * len(SERIES_FIELDS)
+        self._count = 0
+        if len(self) >= self.capacity:
+            self._downsample()
+        self._bucket = len(self)
+
+    def _downsample(self) -> None:
+        for name, column in self.columns.items():
+            merged = array("f")
+            for start in range(0, len(column) - 1, 2):
+                merged.append((column[start] + column[start + 1]) / 2)
+            if len(column) % 2:
+                merged.append(column[-1])
+            self.columns[name] = merged
+        self.interval *= 2
+
+    def flush(self) -> None:
+        if self._count:
+            self._close_bucket()
+
+    def snapshot(self) -> dict:
+        """Full state including the open bucket, unlike ``to_blob`` which closes it."""
+        return {
+            "interval": self.interval,
+            "started_at": self.started_at,
+            "columns": {name: column.tolist() for name, column in self.columns.items()},
+            "bucket": self._bucket,
+            "sums": list(self._sums),
+            "count": self._count,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.interval = state["interval"]
+        self.started_at = state["started_at"]
+        self.columns = {name: array("f", state["columns"].get(name, ())) for name, _, _ in SERIES_FIELDS}
+        self._bucket = state["bucket"]
+        self._sums = list(state["sums"])
+        self._count = state["count"]
+
+    def to_blob(self) -> bytes:
+        self.flush()
+        names = ",".join(name for name, _, _ in SERIES_FIELDS).encode("ascii")
+        header = BLOB_HEADER.pack(BLOB_MAGIC, len(names), len(self), self.interval, self.started_at or 0.0)
+        return b"".join([header, names, *(_little_endian(self.columns[name]) for name, _, _ in SERIES_FIELDS)])
+
+    @staticmethod
+    def decode_blob(blob: bytes | None) -> dict | None:
+        if not blob or len(blob) < BLOB_HEADER.size:
+            return None
+
+        magic, names_length, points, interval, started_at = BLOB_HEADER.unpack_from(blob)
+        if magic != BLOB_MAGIC:
+            return None
+
+        offset = BLOB_HEADER.size
+        names = blob[offset : offset + names_length].decode("ascii").split(",")
+        offset += names_length
+
+        series: dict[str, list[float]] = {}
+        for name in names:
+            column = array("f")
+            column.frombytes(blob[offset : offset + points * column.itemsize])
+            if sys.byteorder != "little":
+                column.byteswap()
+            offset += points * column.itemsize
+            series[name] = [round(value, 3) for value in column]
+
+        return {"interval_seconds": interval, "started_at": started_at, "points": points, "series": series}
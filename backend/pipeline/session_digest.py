@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+
+# Rough English/JSON average; close enough to budget requests without a tokenizer.
+CHARS_PER_TOKEN = 3.5
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRACKED_METRICS: tuple[tuple[str, str, str, str], ...] = (
+    ("words_per_minute", "speech_metrics", "pace (wpm)", "{:.0f}"),
+    ("filler_word_rate", "speech_metrics", "fillers per minute", "{:.1f}"),
+    ("volume_consistency", "speech_metrics", "volume consistency", "{:.2f}"),
+    ("eye_contact_percentage", "visual_signals", "eye contact %", "{:.0f}"),
+    ("posture_score", "visual_signals", "posture", "{:.2f}"),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def estimate_message_tokens(message: dict) -> int:
+    return estimate_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class MetricTrack:
+    first: float | None = None
+    last: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+
+    def update(self, value: float) -> None:
+        if self.first is None:
+            self.first = self.low = self.high = value
+        self.last = value
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+    def render(self, label: str, fmt: str) -> str:
+        span = f"{fmt.format(self.first)} -> {fmt.format(self.last)}"
+        return f"{label} {span} (range {fmt.format(self.low)}-{fmt.format(self.high)})"
+
+
+@dataclass
+class SessionDigest:
+    """Structured rolling summary of a coaching session.
+
+    Each turn updates it in constant time; ``render`` produces a compact,
+    bounded-size text block that replaces compacted history.
+    """
+
+    max_feedback: int = 6
+    max_exercises: int = 8
+    turns: int = 0
+    duration_minutes: float = 0.0
+    feedback: deque[str] = field(default_factory=deque)
+    metrics: dict[str, MetricTrack] = field(default_factory=dict)
+    exercises: list[tuple[float, str]] = field(default_factory=list)
+
+    def observe_turn(self, speech_metrics: dict, visual_signals: dict, session_context: dict) -> None:
+        self.turns += 1
+        self.duration_minutes = float(session_context.get("duration_minutes", self.duration_minutes) or 0.0)
+
+        groups = {"speech_metrics": speech_metrics, "visual_signals": visual_signals}
+        for name, group, _, _ in TRACKED_METRICS:
+            value = groups[group].get(name)
+            if isinstance(value, (int, float)):
+                self.metrics.setdefault(name, MetricTrack()).update(float(value))
+
+        exercise = session_context.get("exercise_type", "free_talk")
+        if not self.exercises or self.exercises[-1][1] != exercise:
+            self.exercises.append((self.duration_minutes, exercise))
+            del self.exercises[: -self.max_exercises]
+
+    def observe_feedback(self, text: str) -> None:
+        self.feedback.append(text[:120])
+        while len(self.feedback) > self.max_feedback:
+            self.feedback.popleft()
+
+    def render(self) -> str:
+        lines = [f"Session summary after {self.turns} coaching turns, {self.duration_minutes:.1f} minutes in."]
+
+        if self.exercises:
+            history = ", ".join(f"{exercise} from {minute:.1f}m" for minute, exercise in self.exercises)
+            lines.append(f"Exercises: {history}.")
+
+        trajectory = [
+            self.metrics[name].render(label, fmt)
+            for name, _, label, fmt in TRACKED_METRICS
+            if name in self.metrics
+        ]
+        if trajectory:
+            lines.append("Metric trajectory (first -> latest): " + "; ".join(trajectory) + ".")
+
+        if self.feedback:
+            lines.append("Recent feedback already given (do not repeat verbatim):")
+            lines.extend(f"- {item}" for item in self.feedback)
+
+        return "\n".join(lines)
+
+    def snapshot(self) -> dict:
+        return {
+            "turns": self.turns,
+            "duration_minutes": self.duration_minutes,
+            "feedback": list(self.feedback),
+            "metrics": {name: asdict(track) for name, track in self.metrics.items()},
+            "exercises": self.exercises,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.turns = state["turns"]
+        self.duration_minutes = state["duration_minutes"]
+        self.feedback = deque(state["feedback"][-self.max_feedback :])
+        self.metrics = {name: MetricTrack(**track) for name, track in state["metrics"].items()}
+        self.exercises = [(minute, exercise) for minute, exercise in state["exercises"]]
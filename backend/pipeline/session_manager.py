@@ -1,11 +1,59 @@
 from __future__ import annotations
 
-import asyncio
-import sqlite3
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .metrics_series import MetricsTimeSeries
+from .session_store import LocalStateStore, SessionStateStore
+from .storage import SQLiteWriter
+from .wire import fast_dumps, fast_loads
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        started_at REAL NOT NULL,
+        ended_at REAL,
+        exercise_type TEXT,
+        summary TEXT,
+        avg_wpm REAL,
+        filler_rate REAL,
+        eye_contact REAL,
+        metrics_series BLOB,
+        status TEXT NOT NULL DEFAULT 'active'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS session_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        payload TEXT
+    )
+    """,
+)
+
+
+def compute_improvement_trend(previous: dict | None, current: dict) -> str:
+    if not previous:
+        return "neutral"
+
+    prev_filler = previous.get("speech_metrics", {}).get("filler_word_rate", 0)
+    curr_filler = current.get("speech_metrics", {}).get("filler_word_rate", 0)
+
+    prev_eye = previous.get("visual_signals", {}).get("eye_contact_percentage", 0)
+    curr_eye = current.get("visual_signals", {}).get("eye_contact_percentage", 0)
+
+    if curr_filler <= prev_filler and curr_eye >= prev_eye:
+        return "positive"
+
+    if curr_filler > prev_filler + 1.0 or curr_eye + 8 < prev_eye:
+        return "negative"
+
+    return "neutral"
+
 
 @dataclass
 class LiveSession:
@@ -17,65 +65,73 @@ class LiveSession:
     feedback: list[str] = field(default_factory=list)
     last_metrics: dict = field(default_factory=dict)
     improvement_trend: str = "neutral"
-    active_response_task: asyncio.Task | None = None
+    metrics_series: MetricsTimeSeries = field(default_factory=MetricsTimeSeries)
+
+    def snapshot(self) -> dict:
+        # Pause belongs to the connection, not the session.
+        return {
+            "started_at": self.started_at,
+            "exercise_type": self.exercise_type,
+            "transcripts": self.transcripts,
+            "feedback": self.feedback,
+            "last_metrics": self.last_metrics,
+            "improvement_trend": self.improvement_trend,
+            "metrics_series": self.metrics_series.snapshot(),
+        }
+
+    def restore(self, state: dict) -> None:
+        self.started_at = state["started_at"]
+        self.exercise_type = state["exercise_type"]
+        self.transcripts = list(state["transcripts"])
+        self.feedback = list(state["feedback"])
+        self.last_metrics = state["last_metrics"]
+        self.improvement_trend = state["improvement_trend"]
+        self.metrics_series.restore(state["metrics_series"])
 
 
 class SessionManager:
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, store: SessionStateStore | None = None, state_ttl: float = 900.0) -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Sessions live in this worker; ``store`` carries them to the next one.
         self.sessions: dict[str, LiveSession] = {}
-        self._init_db()
-
-    def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.db_path)
-        connection.row_factory = sqlite3.Row
-        return connection
-
-    def _init_db(self) -> None:
-        with self._connect() as connection:
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    started_at REAL NOT NULL,
-                    ended_at REAL,
-                    exercise_type TEXT,
-                    summary TEXT,
-                    avg_wpm REAL,
-                    filler_rate REAL,
-                    eye_contact REAL
-                )
-                """
-            )
-            connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS session_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    created_at REAL NOT NULL,
-                    payload TEXT
-                )
-                """
-            )
+        self.store = store or LocalStateStore()
+        self.state_ttl = state_ttl
+        # Writes are queued to a dedicated thread so disk syncs never stall the event loop.
+        self.db = SQLiteWriter(self.db_path, schema=SCHEMA)
+        self.db.submit(self._migrate)
+
+    @staticmethod
+    def _migrate(connection) -> None:
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(sessions)")}
+        if "metrics_series" not in columns:
+            connection.execute("ALTER TABLE sessions ADD COLUMN metrics_series BLOB")
+        if "status" not in columns:
+            connection.execute("ALTER TABLE sessions ADD COLUMN status TEXT NOT NULL DEFAULT 'active'")
+            connection.execute("UPDATE sessions SET status = 'ended' WHERE ended_at IS NOT NULL")
+
+    async def flush(self) -> None:
+        await self.db.flush()
+
+    def close(self) -> None:
+        self.db.close()
+        self.store.close()
 
     def create(self, session_id: str, exercise_type: str) -> LiveSession:
         now = time.time()
         session = LiveSession(session_id=session_id, started_at=now, exercise_type=exercise_type)
         self.sessions[session_id] = session
 
-        with self._connect() as connection:
-            connection.execute(
-                """
-                INSERT OR REPLACE INTO sessions (
-                    session_id,
-                    started_at,
-                    exercise_type
-                ) VALUES (?, ?, ?)
-                """,
-                (session_id, now, exercise_type),
-            )
+        self.db.execute(
+            """
+            INSERT OR REPLACE INTO sessions (
+                session_id,
+                started_at,
+                exercise_type
+            ) VALUES (?, ?, ?)
+            """,
+            (session_id, now, exercise_type),
+        )
 
         return session
 
@@ -88,14 +144,48 @@ class SessionManager:
             return existing
         return self.create(session_id, exercise_type)
 
+    async def attach(self, session_id: str) -> dict:
+        """Make ``session_id`` live in this worker, resuming it from the store if saved.
+
+        Returns the component snapshots saved alongside the session, or an
+        empty dict when the session starts fresh.
+        """
+        if session_id in self.sessions:
+            return {}
+
+        payload = await self.store.load(session_id)
+        if session_id in self.sessions:
+            return {}
+        if payload is None:
+            self.create(session_id, "free_talk")
+            return {}
+
+        state = fast_loads(payload)
+        session = LiveSession(session_id=session_id, started_at=state["session"]["started_at"])
+        session.restore(state["session"])
+        self.sessions[session_id] = session
+        self.db.execute("UPDATE sessions SET status = 'active' WHERE session_id = ?", (session_id,))
+        return state["components"]
+
+    async def checkpoint(self, session_id: str, components: dict) -> None:
+        """Save the session and the given component snapshots for another worker."""
+        session = self.get(session_id)
+        if not session:
+            return
+        # Encoded before the first await so the snapshot is consistent.
+        payload = fast_dumps({"session": session.snapshot(), "components": components})
+        await self.store.save(session_id, payload, self.state_ttl)
+
+    async def discard_state(self, session_id: str) -> None:
+        await self.store.delete(session_id)
+
     def set_exercise(self, session_id: str, exercise_type: str) -> None:
         session = self.ensure(session_id, exercise_type)
         session.exercise_type = exercise_type
-        with self._connect() as connection:
-            connection.execute(
-                "UPDATE sessions SET exercise_type = ? WHERE session_id = ?",
-                (exercise_type, session_id),
-            )
+        self.db.execute(
+            "UPDATE sessions SET exercise_type = ? WHERE session_id = ?",
+            (exercise_type, session_id),
+        )
 
     def pause(self, session_id: str) -> None:
         session = self.get(session_id)
@@ -121,14 +211,13 @@ class SessionManager:
         snippet = response[:180]
         session.feedback.append(snippet)
 
-        with self._connect() as connection:
-            connection.execute(
-                """
-                INSERT INTO session_events (session_id, event_type, created_at, payload)
-                VALUES (?, ?, ?, ?)
-                """,
-                (session_id, "feedback", time.time(), snippet),
-            )
+        self.db.execute(
+            """
+            INSERT INTO session_events (session_id, event_type, created_at, payload)
+            VALUES (?, ?, ?, ?)
+            """,
+            (session_id, "feedback", time.time(), snippet),
+        )
 
     def record_metrics(self, session_id: str, metrics: dict) -> None:
         session = self.get(session_id)
@@ -136,6 +225,13 @@ class SessionManager:
             return
         session.last_metrics = metrics
 
+    def sample_metrics(self, session_id: str, metrics: dict) -> None:
+        """Add the metrics the client is showing to the session's time series."""
+        session = self.get(session_id)
+        if not session:
+            return
+        session.metrics_series.record(time.time(), metrics)
+
     def update_trend(self, session_id: str, trend: str) -> None:
         session = self.get(session_id)
         if session:
@@ -158,31 +254,6 @@ class SessionManager:
             "improvement_trend": session.improvement_trend,
         }
 
-    async def cancel_active_response(self, session_id: str) -> bool:
-        session = self.get(session_id)
-        if not session or not session.active_response_task:
-            return False
-
-        task = session.active_response_task
-        if task.done():
-            return False
-
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
-        except Exception:
-            pass
-
-        return True
-
-    def set_active_response_task(self, session_id: str, task: asyncio.Task | None) -> None:
-        session = self.get(session_id)
-        if not session:
-            return
-        session.active_response_task = task
-
     def finish(self, session_id: str, summary: str = "") -> dict:
         now = time.time()
         session = self.sessions.pop(session_id, None)
@@ -199,22 +270,23 @@ class SessionManager:
         speech_metrics = metrics.get("speech_metrics", {})
         visual_signals = metrics.get("visual_signals", {})
 
-        with self._connect() as connection:
-            connection.execute(
-                """
-                UPDATE sessions
-                SET ended_at = ?, summary = ?, avg_wpm = ?, filler_rate = ?, eye_contact = ?
-                WHERE session_id = ?
-                """,
-                (
-                    now,
-                    summary,
-                    speech_metrics.get("words_per_minute"),
-                    speech_metrics.get("filler_word_rate"),
-                    visual_signals.get("eye_contact_percentage"),
-                    session_id,
-                ),
-            )
+        self.db.execute(
+            """
+            UPDATE sessions
+            SET ended_at = ?, summary = ?, avg_wpm = ?, filler_rate = ?, eye_contact = ?, metrics_series = ?,
+                status = 'ended'
+            WHERE session_id = ?
+            """,
+            (
+                now,
+                summary,
+                speech_metrics.get("words_per_minute"),
+                speech_metrics.get("filler_word_rate"),
+                visual_signals.get("eye_contact_percentage"),
+                session.metrics_series.to_blob() if session.metrics_series.started_at is not None else None,
+                session_id,
+            ),
+        )
 
         return {
             "session_id": session_id,
@@ -225,3 +297,22 @@ class SessionManager:
             "filler_word_rate": speech_metrics.get("filler_word_rate", 0),
             "eye_contact_percentage": visual_signals.get("eye_contact_percentage", 0),
         }
+
+    def suspend(self, session_id: str) -> None:
+        """Release a session whose state was saved for resume, without ending it."""
+        if self.sessions.pop(session_id, None) is None:
+            return
+        self.db.execute("UPDATE sessions SET status = 'suspended' WHERE session_id = ?", (session_id,))
+
+    async def load_session(self, session_id: str) -> dict | None:
+        """Read back a persisted session, including its metrics series, in one row fetch."""
+
+        def fetch(connection) -> dict | None:
+            row = connection.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            record = dict(row)
+            record["metrics_series"] = MetricsTimeSeries.decode_blob(record.get("metrics_series"))
+            return record
+
+        return await self.db.run(fetch)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .storage import SQLiteWriter
+
+STATE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS session_state (
+        session_id TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS session_state_expiry ON session_state (expires_at)",
+)
+
+
+class SessionStateStore(ABC):
+    """Keeps encoded session snapshots where any worker can pick them up.
+
+    A connection that lands on a different worker, or reconnects after the
+    previous worker went away, resumes from the last saved snapshot.
+    Implementations only move opaque strings; encoding belongs to the caller.
+    """
+
+    @abstractmethod
+    async def load(self, session_id: str) -> str | None:
+        ...
+
+    @abstractmethod
+    async def save(self, session_id: str, payload: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class LocalStateStore(SessionStateStore):
+    """In-process stand-in: state survives reconnects but not the worker."""
+
+    entries: dict[str, tuple[float, str]] = field(default_factory=dict)
+
+    def _purge(self, now: float) -> None:
+        expired = [session_id for session_id, (expires_at, _) in self.entries.items() if expires_at <= now]
+        for session_id in expired:
+            del self.entries[session_id]
+
+    async def load(self, session_id: str) -> str | None:
+        entry = self.entries.get(session_id)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    async def save(self, session_id: str, payload: str, ttl: float) -> None:
+        now = time.time()
+        if session_id not in self.entries:
+            self._purge(now)
+        self.entries[session_id] = (now + ttl, payload)
+
+    async def delete(self, session_id: str) -> None:
+        self.entries.pop(session_id, None)
+
+
+class SQLiteStateStore(SessionStateStore):
+    """State in a WAL-mode SQLite file shared by every worker on the host.
+
+    Saves are queued on the writer thread like other session writes, so a
+    checkpoint never blocks the event loop on disk.
+    """
+
+    def __init__(self, db_path: str | Path, purge_interval: float = 60.0) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = SQLiteWriter(self.db_path, schema=STATE_SCHEMA)
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+
+    async def load(self, session_id: str) -> str | None:
+        def fetch(connection) -> str | None:
+            row = connection.execute(
+                "SELECT payload FROM session_state WHERE session_id = ? AND expires_at > ?",
+                (session_id, time.time()),
+            ).fetchone()
+            return row["payload"] if row else None
+
+        return await self.db.run(fetch)
+
+    async def save(self, session_id: str, payload: str, ttl: float) -> None:
+        now = time.time()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            self.db.execute("DELETE FROM session_state WHERE expires_at <= ?", (now,))
+        self.db.execute(
+            "INSERT OR REPLACE INTO session_state (session_id, payload, expires_at) VALUES (?, ?, ?)",
+            (session_id, payload, now + ttl),
+        )
+
+    async def delete(self, session_id: str) -> None:
+        self.db.execute("DELETE FROM session_state WHERE session_id = ?", (session_id,))
+
+    def close(self) -> None:
+        self.db.close()
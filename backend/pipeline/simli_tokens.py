@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class PooledToken:
+    payload: dict[str, Any]
+    expires_at: float
+
+
+@dataclass
+class SimliTokenPool:
+    """Keeps a few pre-minted Simli session tokens ready for new sessions.
+
+    Tokens are treated as stale after ``token_ttl`` seconds, well before Simli
+    expires them, and are discarded instead of handed out. Failed mints back
+    off exponentially up to ``max_retry_delay`` until one succeeds.
+    """
+
+    mint: Callable[[], Awaitable[dict[str, Any] | None]]
+    target_size: int = 2
+    token_ttl: float = 240.0
+    retry_delay: float = 5.0
+    max_retry_delay: float = 300.0
+    tokens: deque[PooledToken] = field(default_factory=deque)
+    hits: int = 0
+    misses: int = 0
+
+    def __post_init__(self) -> None:
+        self._refill_task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def _discard_expired(self, now: float) -> None:
+        while self.tokens and self.tokens[0].expires_at <= now:
+            self.tokens.popleft()
+
+    def take(self) -> dict[str, Any] | None:
+        self._discard_expired(time.time())
+        token = self.tokens.popleft() if self.tokens else None
+        if token:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._wakeup.set()
+        self.schedule_refill()
+        return token.payload if token else None
+
+    def schedule_refill(self) -> None:
+        if self.target_size <= 0 or (self._refill_task and not self._refill_task.done()):
+            return
+        self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        delay = self.retry_delay
+        while True:
+            self._discard_expired(time.time())
+            if len(self.tokens) >= self.target_size:
+                # Wake up when a token is taken or the oldest one goes stale.
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), max(0.1, self.tokens[0].expires_at - time.time()))
+                continue
+
+            payload = await self.mint()
+            if not payload:
+                await asyncio.sleep(delay * (0.5 + random.random()))
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            self.tokens.append(PooledToken(payload=payload, expires_at=time.time() + self.token_ttl))
+
+    async def aclose(self) -> None:
+        if self._refill_task:
+            self._refill_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._refill_task
+        self.tokens.clear()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Coroutine
+
+from .filler_lexicon import tokenize
+
+
+def transcript_similarity(partial: str, final: str) -> float:
+    """Word-level similarity between a partial and a final transcript, 0.0 to 1.0."""
+    partial_words = tokenize(partial)
+    final_words = tokenize(final)
+    if not partial_words and not final_words:
+        return 1.0
+    return SequenceMatcher(None, partial_words, final_words, autojunk=False).ratio()
+
+
+@dataclass
+class PendingDraft:
+    transcript: str
+    task: asyncio.Task
+    started_at: float
+
+
+@dataclass
+class Speculator:
+    """Holds at most one speculative coaching draft and tracks how often it pays off.
+
+    A draft is started from the latest partial transcript while the speaker
+    pauses. When the final transcript arrives it is either a hit (similar
+    enough, the draft is used) or a miss (cancelled so a fresh response is
+    generated). Drafts that are never matched are counted as discarded.
+    """
+
+    threshold: float = 0.85
+    started: int = 0
+    hits: int = 0
+    misses: int = 0
+    discarded: int = 0
+    lead_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.pending: PendingDraft | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.pending is not None and not self.pending.task.cancelled()
+
+    def start(self, transcript: str, draft: Coroutine[Any, Any, Any]) -> None:
+        self.discard()
+        self.pending = PendingDraft(transcript, asyncio.create_task(draft), time.time())
+        self.started += 1
+
+    def resolve(self, final_transcript: str) -> asyncio.Task | None:
+        """Return the draft task if it matches ``final_transcript``, else cancel it."""
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return None
+
+        failed = pending.task.done() and (pending.task.cancelled() or pending.task.exception() is not None)
+        if not failed and transcript_similarity(pending.transcript, final_transcript) >= self.threshold:
+            self.hits += 1
+            self.lead_seconds += time.time() - pending.started_at
+            return pending.task
+
+        pending.task.cancel()
+        self.misses += 1
+        return None
+
+    def discard(self) -> None:
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return
+        pending.task.cancel()
+        self.discarded += 1
+
+    def stats(self) -> dict[str, float | int]:
+        resolved = self.hits + self.misses
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "hit_rate": round(self.hits / resolved, 3) if resolved else 0.0,
+            "avg_lead_seconds": round(self.lead_seconds / self.hits, 3) if self.hits else 0.0,
+        }
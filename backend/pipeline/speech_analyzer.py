@@ -1,52 +1,99 @@
 from __future__ import annotations
 
-import re
+import math
 from collections import Counter, deque
 from dataclasses import dataclass, field
-from statistics import mean, pstdev
 
+from .filler_lexicon import FillerMatcher, get_filler_matcher, lexicon_for, matcher_for_language
 
-WORD_PATTERN = re.compile(r"[A-Za-z']+")
+
+@dataclass
+class RollingStats:
+    """Sliding-window mean and population variance (Welford with removal)."""
+
+    maxlen: int
+    values: deque[float] = field(default_factory=deque)
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, value: float) -> None:
+        if len(self.values) >= self.maxlen:
+            self._remove(self.values.popleft())
+
+        self.values.append(value)
+        count = len(self.values)
+        delta = value - self.mean
+        self.mean += delta / count
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        count = len(self.values)
+        if count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+
+        previous_mean = self.mean
+        self.mean = (previous_mean * (count + 1) - value) / count
+        self.m2 = max(0.0, self.m2 - (value - previous_mean) * (value - self.mean))
+
+    def pstdev(self) -> float:
+        if not self.values:
+            return 0.0
+        return math.sqrt(self.m2 / len(self.values))
+
+    def snapshot(self) -> dict:
+        return {"values": list(self.values), "mean": self.mean, "m2": self.m2}
+
+    def restore(self, state: dict) -> None:
+        self.values = deque(state["values"][-self.maxlen :])
+        self.mean = state["mean"]
+        self.m2 = state["m2"]
 
 
 @dataclass
 class SpeechAnalyzer:
     """Analyzes transcript chunks to produce live coaching metrics."""
 
-    filler_terms: tuple[str, ...] = (
-        "um",
-        "uh",
-        "uhh",
-        "umm",
-        "hmm",
-        "hm",
-        "like",
-        "you know",
-        "basically",
-        "actually",
-        "literally",
-        "right",
-        "so",
-        "well",
-        "i mean",
-        "kind of",
-        "sort of",
-        "stuff like that",
-    )
+    filler_terms: tuple[str, ...] | None = None
+    language: str = "en"
     session_start: float | None = None
     last_word_time: float | None = None
     total_words: int = 0
     filler_counts: Counter[str] = field(default_factory=Counter)
+    total_fillers: int = 0
     pause_durations: list[float] = field(default_factory=list)
-    volume_samples: deque[float] = field(default_factory=lambda: deque(maxlen=240))
+    volume_samples: RollingStats = field(default_factory=lambda: RollingStats(maxlen=240))
     recent_word_events: deque[tuple[float, int]] = field(default_factory=lambda: deque(maxlen=720))
     latest_interim_text: str = ""
     latest_interim_word_count: int = 0
+    latest_interim_fillers: dict[str, int] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
-        self._patterns = {
-            term: re.compile(rf"\b{re.escape(term)}\b", flags=re.IGNORECASE) for term in self.filler_terms
-        }
+        # Matchers are cached per lexicon and shared by every session.
+        if self.filler_terms is None:
+            self.filler_terms = lexicon_for(self.language)
+            self._matcher: FillerMatcher = matcher_for_language(self.language)
+        else:
+            self._matcher = get_filler_matcher(tuple(self.filler_terms))
+
+    def ingest_audio(self, rms: float, timestamp: float) -> None:
+        """Record an audio chunk's level without building a metrics payload."""
+        if self.session_start is None:
+            self.session_start = timestamp
+        self.volume_samples.append(max(0.0, min(1.0, rms)))
+
+    def _set_interim(self, normalized: str) -> None:
+        if normalized == self.latest_interim_text:
+            return
+        self.latest_interim_text = normalized
+        if normalized:
+            self.latest_interim_word_count, self.latest_interim_fillers = self._matcher.scan(normalized)
+        else:
+            self.latest_interim_word_count, self.latest_interim_fillers = 0, {}
 
     def process_transcription(
         self,
@@ -64,23 +111,20 @@ class SpeechAnalyzer:
         normalized = text.strip().lower()
 
         if not is_final:
-            self.latest_interim_text = normalized
-            self.latest_interim_word_count = len(WORD_PATTERN.findall(normalized))
+            self._set_interim(normalized)
             return self.get_current_metrics(timestamp)
 
         if not normalized:
-            self.latest_interim_text = ""
-            self.latest_interim_word_count = 0
+            self._set_interim("")
             return self.get_current_metrics(timestamp)
 
-        word_count = len(WORD_PATTERN.findall(normalized))
+        word_count, fillers = self._matcher.scan(normalized)
         self.total_words += word_count
         self.recent_word_events.append((timestamp, word_count))
 
-        for filler, pattern in self._patterns.items():
-            matches = pattern.findall(normalized)
-            if matches:
-                self.filler_counts[filler] += len(matches)
+        for filler, count in fillers.items():
+            self.filler_counts[filler] += count
+            self.total_fillers += count
 
         if self.last_word_time is not None:
             pause = timestamp - self.last_word_time
@@ -88,8 +132,7 @@ class SpeechAnalyzer:
                 self.pause_durations.append(pause)
 
         self.last_word_time = timestamp
-        self.latest_interim_text = ""
-        self.latest_interim_word_count = 0
+        self._set_interim("")
         return self.get_current_metrics(timestamp)
 
     def get_current_metrics(self, timestamp: float | None = None) -> dict:
@@ -99,26 +142,24 @@ class SpeechAnalyzer:
         now = timestamp if timestamp is not None else self.last_word_time or self.session_start
         elapsed_minutes = max((now - self.session_start) / 60, 0.1)
 
-        effective_fillers = Counter(self.filler_counts)
-        if self.latest_interim_text:
-            for filler, pattern in self._patterns.items():
-                matches = pattern.findall(self.latest_interim_text)
-                if matches:
-                    effective_fillers[filler] += len(matches)
+        effective_fillers = dict(self.filler_counts)
+        total_fillers = self.total_fillers
+        for filler, count in self.latest_interim_fillers.items():
+            effective_fillers[filler] = effective_fillers.get(filler, 0) + count
+            total_fillers += count
 
-        total_fillers = sum(effective_fillers.values())
         effective_total_words = self.total_words + self.latest_interim_word_count
 
         volume_consistency = 0.0
         if len(self.volume_samples) > 3:
-            average = mean(self.volume_samples)
-            deviation = pstdev(self.volume_samples)
+            average = self.volume_samples.mean
+            deviation = self.volume_samples.pstdev()
             if average > 0:
                 volume_consistency = max(0.0, min(1.0, 1 - (deviation / average)))
 
         return {
             "words_per_minute": round(effective_total_words / elapsed_minutes),
-            "filler_words": dict(effective_fillers),
+            "filler_words": effective_fillers,
             "filler_word_rate": round(total_fillers / elapsed_minutes, 1),
             "pause_count": len(self.pause_durations),
             "longest_pause_seconds": round(max(self.pause_durations, default=0.0), 1),
@@ -126,3 +167,33 @@ class SpeechAnalyzer:
             "total_words": effective_total_words,
             "elapsed_minutes": round(elapsed_minutes, 2),
         }
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state; ``restore`` applies it to an analyzer with the same lexicon."""
+        return {
+            "session_start": self.session_start,
+            "last_word_time": self.last_word_time,
+            "total_words": self.total_words,
+            "filler_counts": dict(self.filler_counts),
+            "total_fillers": self.total_fillers,
+            "pause_durations": self.pause_durations,
+            "volume_samples": self.volume_samples.snapshot(),
+            "recent_word_events": list(self.recent_word_events),
+            "latest_interim_text": self.latest_interim_text,
+            "latest_interim_word_count": self.latest_interim_word_count,
+            "latest_interim_fillers": self.latest_interim_fillers,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.session_start = state["session_start"]
+        self.last_word_time = state["last_word_time"]
+        self.total_words = state["total_words"]
+        self.filler_counts = Counter(state["filler_counts"])
+        self.total_fillers = state["total_fillers"]
+        self.pause_durations = list(state["pause_durations"])
+        self.volume_samples.restore(state["volume_samples"])
+        self.recent_word_events.clear()
+        self.recent_word_events.extend((timestamp, count) for timestamp, count in state["recent_word_events"])
+        self.latest_interim_text = state["latest_interim_text"]
+        self.latest_interim_word_count = state["latest_interim_word_count"]
+        self.latest_interim_fillers = dict(state["latest_interim_fillers"])
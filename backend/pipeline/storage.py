@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+_DRAINED = object()
+
+
+@dataclass
+class _Write:
+    sql: str
+    params: tuple[Any, ...]
+
+
+@dataclass
+class _Call:
+    fn: Callable[[sqlite3.Connection], Any]
+    future: Future = field(default_factory=Future)
+
+
+class SQLiteWriter:
+    """Owns one long-lived WAL connection on a dedicated writer thread.
+
+    Writes are queued without blocking the event loop and committed in
+    batches: everything queued while the previous transaction ran goes into
+    the next one. ``flush`` waits until all earlier writes are durable.
+    """
+
+    def __init__(self, db_path: str | Path, schema: tuple[str, ...] = (), max_batch: int = 256) -> None:
+        self.db_path = Path(db_path)
+        self.schema = schema
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue[_Write | _Call | None] = queue.SimpleQueue()
+        self._ready = threading.Event()
+        self._startup_error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._closed = False
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error:
+            self._closed = True
+            raise self._startup_error
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.schema:
+            connection.execute(statement)
+        return connection
+
+    def execute(self, sql: str, params: tuple[Any, ...] = ()) -> None:
+        if self._closed:
+            raise RuntimeError("SQLiteWriter is closed")
+        self._queue.put(_Write(sql, params))
+
+    def submit(self, fn: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Run ``fn`` on the writer thread after every write queued before it."""
+        call = _Call(fn)
+        if self._closed:
+            call.future.set_exception(RuntimeError("SQLiteWriter is closed"))
+            return call.future
+        self._queue.put(call)
+        return call.future
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.wrap_future(self.submit(fn))
+
+    async def flush(self) -> None:
+        await self.run(lambda _: None)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            connection = self._open()
+        except Exception as error:
+            self._startup_error = error
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            while True:
+                item = self._queue.get()
+                batch: list[_Write] = []
+                while isinstance(item, _Write):
+                    batch.append(item)
+                    if len(batch) >= self.max_batch:
+                        item = _DRAINED
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = _DRAINED
+
+                if batch:
+                    self._commit(connection, batch)
+
+                if isinstance(item, _Call):
+                    try:
+                        item.future.set_result(item.fn(connection))
+                    except Exception as error:
+                        item.future.set_exception(error)
+                elif item is None:
+                    break
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _commit(connection: sqlite3.Connection, batch: list[_Write]) -> None:
+        connection.execute("BEGIN")
+        try:
+            for write in batch:
+                try:
+                    connection.execute(write.sql, write.params)
+                except sqlite3.Error:
+                    # One bad statement must not drop the rest of the batch.
+                    continue
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from urllib.parse import urlencode
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency during bootstrap
+    websockets = None  # type: ignore
+
+from .stt_pool import STTConnectionPool, STTPoolKey
+from .wire import fast_dumps, fast_loads
+
+ELEVENLABS_STT_ENDPOINT = "wss://api.elevenlabs.io/v1/speech-to-text/realtime"
+
+ERROR_MESSAGE_TYPES = frozenset(
+    {
+        "warning",
+        "auth_error",
+        "quota_exceeded_error",
+        "transcriber_error",
+        "input_error",
+        "commit_throttled",
+        "unaccepted_terms_error",
+        "rate_limited",
+        "queue_overflow",
+        "resource_exhausted",
+        "session_time_limit_exceeded",
+        "chunk_size_exceeded",
+        "insufficient_audio_activity",
+        "error",
+    }
+)
+# Errors that a new connection will not fix; the client stops reconnecting.
+FATAL_MESSAGE_TYPES = frozenset({"auth_error", "quota_exceeded_error", "unaccepted_terms_error"})
+
+
+def normalize_commit_strategy(commit_strategy: str) -> str:
+    """Map a configured commit strategy onto one ElevenLabs accepts, defaulting to ``vad``."""
+    commit_strategy = commit_strategy.strip().lower()
+    return commit_strategy if commit_strategy in {"manual", "vad"} else "vad"
+
+
+def stt_url(endpoint: str, model_id: str, sample_rate: int, language_code: str, commit_strategy: str) -> str:
+    query = urlencode(
+        {
+            "model_id": model_id,
+            "audio_format": f"pcm_{sample_rate}",
+            "language_code": language_code,
+            "include_timestamps": "true",
+            "commit_strategy": commit_strategy,
+            "vad_silence_threshold_secs": "1.0",
+        }
+    )
+    return f"{endpoint}?{query}"
+
+
+async def open_stt_socket(url: str, api_key: str):
+    return await websockets.connect(
+        url,
+        additional_headers={"xi-api-key": api_key},
+        ping_interval=20,
+        ping_timeout=20,
+        max_size=2_000_000,
+    )
+
+
+@dataclass
+class AudioPacket:
+    pcm: bytes
+    sample_rate: int
+    commit: bool = False
+
+
+class ElevenLabsRealtimeSTTClient:
+    """Realtime STT client backed by ElevenLabs Scribe v2.
+
+    The upstream socket is supervised: when it drops, the client reconnects
+    with exponential backoff and replays the audio sent since the last commit
+    (up to ``replay_seconds``) so the in-progress utterance is not lost.
+    Outgoing audio is bounded by ``max_buffer_seconds`` worth of bytes; the
+    oldest audio is dropped beyond that, and counted.
+
+    Small client chunks are coalesced into upstream packets of about
+    ``chunk_ms`` of audio. A partly filled packet goes out after
+    ``max_delay_ms`` or on commit, so larger chunks trade upstream message
+    rate for at most that much added latency.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None,
+        on_transcript: Callable[[str, bool, float], Awaitable[None]],
+        on_error: Callable[[str], Awaitable[None]] | None = None,
+        model_id: str = "scribe_v2_realtime",
+        commit_strategy: str = "vad",
+        sample_rate: int = 16000,
+        language_code: str = "en",
+        endpoint: str = ELEVENLABS_STT_ENDPOINT,
+        max_buffer_seconds: float = 3.0,
+        replay_seconds: float = 5.0,
+        reconnect_initial_delay: float = 0.25,
+        reconnect_max_delay: float = 8.0,
+        chunk_ms: float = 160.0,
+        max_delay_ms: float = 250.0,
+        max_chunk_ms: float = 1000.0,
+        pool: STTConnectionPool | None = None,
+    ) -> None:
+        self.api_key = api_key
+        self.on_transcript = on_transcript
+        self.on_error = on_error
+        self.model_id = model_id
+        self.commit_strategy = normalize_commit_strategy(commit_strategy)
+        self.sample_rate = sample_rate
+        self.language_code = language_code
+        self.endpoint = endpoint
+        self.pool = pool
+        self.replay_bytes = int(replay_seconds * sample_rate * 2)
+        self.reconnect_initial_delay = reconnect_initial_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.chunk_ms = chunk_ms
+        self.max_delay_ms = max(max_delay_ms, 0.0)
+        self.max_chunk_ms = max(max_chunk_ms, chunk_ms)
+        # The backlog must hold at least a couple of coalesced packets.
+        self.max_buffered_bytes = max(
+            int(max_buffer_seconds * sample_rate * 2),
+            2 * self._bytes_for(chunk_ms, sample_rate),
+        )
+
+        self.ws = None
+        self.pending: deque[AudioPacket] = deque()
+        self.pending_bytes = 0
+        self.replay: deque[AudioPacket] = deque()
+        self.replay_buffered = 0
+        self._wakeup = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._fatal = False
+        self.supervisor_task: asyncio.Task | None = None
+        self._staging = bytearray()
+        self._staging_rate = sample_rate
+        self._staging_deadline: asyncio.TimerHandle | None = None
+
+        self.reconnects = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.replayed_bytes = 0
+        self.chunks_received = 0
+        self.packets_sent = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def pool_key(self) -> STTPoolKey:
+        return STTPoolKey(self.model_id, self.sample_rate, self.language_code, self.commit_strategy)
+
+    async def _open(self):
+        if self.pool:
+            warm = self.pool.take(self.pool_key)
+            if warm:
+                return warm
+        return await open_stt_socket(
+            stt_url(self.endpoint, self.model_id, self.sample_rate, self.language_code, self.commit_strategy),
+            self.api_key,
+        )
+
+    async def connect(self) -> None:
+        """Start the connection supervisor and wait for the first attempt."""
+        if not self.api_key or self.supervisor_task:
+            return
+
+        first_attempt = asyncio.Event()
+        self.supervisor_task = asyncio.create_task(self._supervise(first_attempt))
+        await first_attempt.wait()
+
+    async def _supervise(self, first_attempt: asyncio.Event) -> None:
+        delay = self.reconnect_initial_delay
+        attempt = 0
+        while not self._closing and not self._fatal:
+            try:
+                self.ws = await self._open()
+            except Exception as error:
+                self.ws = None
+                if attempt == 0 and self.on_error:
+                    await self.on_error(f"connection failed: {error}")
+            else:
+                if attempt:
+                    self.reconnects += 1
+                connected_at = time.monotonic()
+                first_attempt.set()
+                await self._serve_connection()
+                if time.monotonic() - connected_at > self.reconnect_max_delay:
+                    delay = self.reconnect_initial_delay
+            first_attempt.set()
+
+            if self._closing or self._fatal:
+                break
+            attempt += 1
+            await asyncio.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _serve_connection(self) -> None:
+        self._requeue_replay()
+        self._connected.set()
+        sender = asyncio.create_task(self._sender())
+        receiver = asyncio.create_task(self._receiver())
+        try:
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self._connected.clear()
+            for task in (sender, receiver):
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+            ws, self.ws = self.ws, None
+            if ws:
+                with contextlib.suppress(Exception):
+                    await ws.close()
+
+    def _requeue_replay(self) -> None:
+        # Audio already sent for the open utterance goes out again first.
+        if not self.replay:
+            return
+        replayed = sum(len(packet.pcm) for packet in self.replay)
+        self.replayed_bytes += replayed
+        self.pending.extendleft(reversed(self.replay))
+        self.pending_bytes += replayed
+        self.replay.clear()
+        self.replay_buffered = 0
+
+    def _enqueue(self, packet: AudioPacket) -> None:
+        self.pending.append(packet)
+        self.pending_bytes += len(packet.pcm)
+        while self.pending_bytes > self.max_buffered_bytes:
+            # Drop the oldest audio under pressure to keep latency low; commits stay.
+            index = next((i for i, item in enumerate(self.pending) if not item.commit), None)
+            if index is None:
+                break
+            dropped = self.pending[index]
+            del self.pending[index]
+            self.pending_bytes -= len(dropped.pcm)
+            self.dropped_chunks += 1
+            self.dropped_bytes += len(dropped.pcm)
+        self._wakeup.set()
+
+    @staticmethod
+    def _bytes_for(duration_ms: float, sample_rate: int) -> int:
+        # 16-bit mono PCM; keep packets sample-aligned.
+        return max(2, int(sample_rate * duration_ms / 1000) * 2)
+
+    def _flush_staging(self) -> None:
+        if self._staging_deadline:
+            self._staging_deadline.cancel()
+            self._staging_deadline = None
+        if self._staging:
+            # One oversized client chunk must still go upstream within max_chunk_ms per message.
+            limit = self._bytes_for(self.max_chunk_ms, self._staging_rate)
+            for start in range(0, len(self._staging), limit):
+                self._enqueue(AudioPacket(bytes(self._staging[start : start + limit]), self._staging_rate))
+            self._staging.clear()
+
+    async def send_audio(self, pcm_chunk: bytes | memoryview, sample_rate: int | None = None) -> None:
+        if not self.enabled:
+            return
+
+        rate = sample_rate or self.sample_rate
+        if self._staging and rate != self._staging_rate:
+            self._flush_staging()
+        if not self._staging and self.max_delay_ms:
+            self._staging_deadline = asyncio.get_running_loop().call_later(
+                self.max_delay_ms / 1000, self._flush_staging
+            )
+
+        self.chunks_received += 1
+        self._staging_rate = rate
+        self._staging += pcm_chunk
+        if len(self._staging) >= self._bytes_for(self.chunk_ms, rate):
+            self._flush_staging()
+
+    async def commit(self, sample_rate: int | None = None) -> None:
+        if not self.enabled:
+            return
+        self._flush_staging()
+        self._enqueue(AudioPacket(b"", sample_rate or self.sample_rate, commit=True))
+
+    def _remember(self, packet: AudioPacket) -> None:
+        if packet.commit:
+            self.replay.clear()
+            self.replay_buffered = 0
+            return
+        self.replay.append(packet)
+        self.replay_buffered += len(packet.pcm)
+        while self.replay_buffered > self.replay_bytes and self.replay:
+            self.replay_buffered -= len(self.replay.popleft().pcm)
+
+    async def _sender(self) -> None:
+        while True:
+            if not self.pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # In-flight packets are out of the queue, so backpressure in _enqueue cannot drop them.
+            packets = self._take_batch()
+            first = packets[0]
+            pcm = first.pcm if len(packets) == 1 else b"".join(packet.pcm for packet in packets)
+            try:
+                await self.ws.send(
+                    fast_dumps(
+                        {
+                            "message_type": "input_audio_chunk",
+                            "audio_base_64": base64.b64encode(pcm).decode("ascii"),
+                            "commit": first.commit,
+                            "sample_rate": first.sample_rate,
+                        }
+                    )
+                )
+            except BaseException:
+                # Not on the wire: back to the front so the next connection retries it.
+                self.pending.extendleft(reversed(packets))
+                self.pending_bytes += sum(len(packet.pcm) for packet in packets)
+                raise
+            self.packets_sent += 1
+            for packet in packets:
+                self._remember(packet)
+
+    def _take_batch(self) -> list[AudioPacket]:
+        """Remove the next upstream message from the queue: a commit, or audio merged up to ``max_chunk_ms``."""
+        first = self.pending.popleft()
+        self.pending_bytes -= len(first.pcm)
+        if first.commit:
+            return [first]
+
+        limit = self._bytes_for(self.max_chunk_ms, first.sample_rate)
+        batch = [first]
+        size = len(first.pcm)
+        while self.pending:
+            packet = self.pending[0]
+            if packet.commit or packet.sample_rate != first.sample_rate or size + len(packet.pcm) > limit:
+                break
+            self.pending.popleft()
+            self.pending_bytes -= len(packet.pcm)
+            batch.append(packet)
+            size += len(packet.pcm)
+        return batch
+
+    async def _receiver(self) -> None:
+        async for payload in self.ws:
+            if not isinstance(payload, str):
+                continue
+
+            try:
+                message = fast_loads(payload)
+            except ValueError:
+                continue
+
+            message_type = message.get("message_type")
+
+            if message_type in {"partial_transcript", "committed_transcript", "committed_transcript_with_timestamps"}:
+                transcript = (message.get("text") or "").strip()
+                if not transcript:
+                    continue
+                is_final = message_type != "partial_transcript"
+                await self.on_transcript(transcript, is_final, time.time())
+                continue
+
+            if message_type == "session_started":
+                continue
+
+            if message_type in FATAL_MESSAGE_TYPES:
+                self._fatal = True
+
+            if message_type in ERROR_MESSAGE_TYPES and self.on_error:
+                detail = message.get("detail") or message.get("error") or message.get("message") or message
+                await self.on_error(str(detail))
+                continue
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "reconnects": self.reconnects,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "replayed_bytes": self.replayed_bytes,
+            "buffered_bytes": self.pending_bytes,
+            "chunks_received": self.chunks_received,
+            "packets_sent": self.packets_sent,
+        }
+
+    async def close(self, drain_timeout: float = 2.0) -> None:
+        """Send what is still queued if connected, then shut the supervisor down."""
+        self._flush_staging()
+        self._closing = True
+        self._wakeup.set()
+
+        if self.supervisor_task:
+            if self._connected.is_set():
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(asyncio.shield(self.supervisor_task), drain_timeout)
+            self.supervisor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self.supervisor_task
+            self.supervisor_task = None
+
+        if self.ws:
+            with contextlib.suppress(Exception):
+                await self.ws.close()
+            self.ws = None
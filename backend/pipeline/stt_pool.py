@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class STTPoolKey(NamedTuple):
+    model_id: str
+    sample_rate: int
+    language_code: str
+    commit_strategy: str
+
+
+@dataclass
+class WarmConnection:
+    ws: Any
+    opened_at: float
+
+
+def _is_open(ws: Any) -> bool:
+    state = getattr(ws, "state", None)
+    # websockets reports State.OPEN, which is 1.
+    return state is not None and int(state) == 1
+
+
+@dataclass
+class STTConnectionPool:
+    """Keeps upstream STT sockets open ahead of demand.
+
+    Connections are pooled per ``STTPoolKey`` since the query string is fixed
+    at connect time. The number kept warm follows an EWMA of the session
+    arrival rate: enough for the sessions expected over ``horizon`` seconds,
+    clamped to ``min_size``..``max_size``. Idle sockets are pinged every
+    ``check_interval`` and rotated out after ``max_age`` seconds.
+    """
+
+    open: Callable[[STTPoolKey], Awaitable[Any]]
+    min_size: int = 1
+    max_size: int = 4
+    max_age: float = 45.0
+    horizon: float = 10.0
+    check_interval: float = 5.0
+    ewma_alpha: float = 0.3
+    retry_delay: float = 5.0
+    idle: dict[STTPoolKey, deque[WarmConnection]] = field(default_factory=dict)
+    arrival_rate: float = 0.0
+    hits: int = 0
+    misses: int = 0
+    opened: int = 0
+    expired: int = 0
+    unhealthy: int = 0
+
+    def __post_init__(self) -> None:
+        self._last_arrival: float | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # Strong references so pending closes are not garbage-collected mid-flight.
+        self._closing: set[asyncio.Task] = set()
+
+    def register(self, key: STTPoolKey) -> None:
+        self.idle.setdefault(key, deque())
+        self._wakeup.set()
+
+    def _record_arrival(self, now: float) -> None:
+        if self._last_arrival is not None:
+            instant = 1.0 / max(now - self._last_arrival, 0.1)
+            self.arrival_rate = self.ewma_alpha * instant + (1 - self.ewma_alpha) * self.arrival_rate
+        self._last_arrival = now
+
+    def target_size(self, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        rate = self.arrival_rate
+        if self._last_arrival is not None and now > self._last_arrival:
+            # A quiet spell pulls the estimate down without waiting for the next arrival.
+            rate = min(rate, 1.0 / (now - self._last_arrival))
+        return max(self.min_size, min(self.max_size, math.ceil(rate * self.horizon)))
+
+    def take(self, key: STTPoolKey) -> Any | None:
+        now = time.monotonic()
+        self._record_arrival(now)
+        connections = self.idle.setdefault(key, deque())
+        self._wakeup.set()
+        while connections:
+            warm = connections.pop()
+            if _is_open(warm.ws) and now - warm.opened_at < self.max_age:
+                self.hits += 1
+                return warm.ws
+            self._discard(warm)
+        self.misses += 1
+        return None
+
+    def _discard(self, warm: WarmConnection) -> None:
+        task = asyncio.create_task(self._close(warm.ws))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(ws: Any) -> None:
+        with contextlib.suppress(Exception):
+            await ws.close()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+
+    async def _maintain(self) -> None:
+        while True:
+            failed = False
+            try:
+                for key in list(self.idle):
+                    await self._check(key)
+                    failed = not await self._fill(key) or failed
+            except Exception:
+                # One bad pass must not stop refills and health checks for good.
+                logger.exception("STT pool maintenance pass failed")
+                failed = True
+
+            self._wakeup.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.retry_delay if failed else self.check_interval)
+
+    async def _check(self, key: STTPoolKey) -> None:
+        now = time.monotonic()
+        healthy: deque[WarmConnection] = deque()
+        # A snapshot: take() pops from the live deque while pings are awaited.
+        for warm in list(self.idle[key]):
+            if now - warm.opened_at >= self.max_age:
+                self.expired += 1
+                self._discard(warm)
+                continue
+            try:
+                pong = await warm.ws.ping()
+                await asyncio.wait_for(pong, timeout=2.0)
+            except Exception:
+                self.unhealthy += 1
+                self._discard(warm)
+                continue
+            healthy.append(warm)
+        # Connections taken while pinging are no longer in the idle deque.
+        self.idle[key] = deque(warm for warm in healthy if warm in self.idle[key])
+
+    async def _fill(self, key: STTPoolKey) -> bool:
+        connections = self.idle[key]
+        target = self.target_size()
+        while len(connections) > target:
+            self._discard(connections.popleft())
+        while len(connections) < target:
+            try:
+                ws = await self.open(key)
+            except Exception:
+                return False
+            self.opened += 1
+            connections.append(WarmConnection(ws, time.monotonic()))
+        return True
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "idle": sum(len(connections) for connections in self.idle.values()),
+            "target": self.target_size(),
+            "arrival_rate": round(self.arrival_rate, 4),
+            "hits": self.hits,
+            "misses": self.misses,
+            "opened": self.opened,
+            "expired": self.expired,
+            "unhealthy": self.unhealthy,
+        }
+
+    async def aclose(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._task
+            self._task = None
+        for connections in self.idle.values():
+            while connections:
+                await self._close(connections.popleft().ws)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
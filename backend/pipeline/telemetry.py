@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # pragma: no cover - optional dependency during bootstrap
+    CollectorRegistry = None  # type: ignore
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_PREFIX = "speech_coach"
+
+STAGES = (
+    "audio_ingress",
+    "stt_partial",
+    "stt_final",
+    "metrics_computed",
+    "should_coach",
+    "llm_first_token",
+    "llm_complete",
+    "tts_first_byte",
+    "tts_complete",
+    "avatar_ready",
+    "coach_response_sent",
+)
+
+# Each stage is timed from the stage it waits on. ``audio_ingress`` has no
+# parent: it is observed as the time spent handling one inbound audio chunk.
+# The whole turn, first voiced audio to first coach response, is the "turn" stage.
+STAGE_PARENTS = {
+    "stt_partial": "audio_ingress",
+    "stt_final": "audio_ingress",
+    "metrics_computed": "stt_final",
+    "should_coach": "metrics_computed",
+    "llm_first_token": "should_coach",
+    "llm_complete": "should_coach",
+    "tts_first_byte": "llm_first_token",
+    "tts_complete": "tts_first_byte",
+    "avatar_ready": "should_coach",
+    "coach_response_sent": "stt_final",
+}
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+# Stats keys exported as counters, by source group; any other numeric key is a gauge.
+COUNTER_KEYS = {
+    "stt": ("reconnects", "dropped_chunks", "dropped_bytes", "replayed_bytes", "chunks_received", "packets_sent"),
+    "coach_scheduler": ("started", "completed", "cancelled", "preempted", "coalesced", "dropped"),
+    "llm": (
+        "requests",
+        "input_tokens",
+        "output_tokens",
+        "cache_read_input_tokens",
+        "cache_creation_input_tokens",
+        "compactions",
+        "cancelled_requests",
+        "wasted_tokens",
+    ),
+    "speculation": ("started", "hits", "misses", "discarded"),
+    "stt_pool": ("hits", "misses", "opened", "expired", "unhealthy"),
+    "tts_cache": ("hits", "misses", "disk_evictions"),
+}
+
+StatsSource = Callable[[], dict]
+
+
+def _discard(stage: str, seconds: float) -> None:
+    pass
+
+
+@dataclass
+class TurnTrace:
+    """Stage timestamps for one utterance and the coach response it triggers.
+
+    Only the first mark of each stage counts, so a multi-sentence response is
+    timed by its first sentence, which is what the speaker hears first.
+    """
+
+    observe: Callable[[str, float], None] = _discard
+    marks: dict[str, float] = field(default_factory=dict)
+
+    def mark(self, stage: str, at: float | None = None) -> None:
+        if stage in self.marks:
+            return
+        at = time.perf_counter() if at is None else at
+        self.marks[stage] = at
+        parent = STAGE_PARENTS.get(stage)
+        if parent in self.marks:
+            self.observe(stage, at - self.marks[parent])
+        if stage == "coach_response_sent" and "audio_ingress" in self.marks:
+            self.observe("turn", at - self.marks["audio_ingress"])
+
+
+@dataclass
+class SessionTracer:
+    """Opens a trace per utterance; a final transcript hands it to the coach turn."""
+
+    observe: Callable[[str, float], None]
+    current: TurnTrace | None = None
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    max_samples: int = 500
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        self.observe(stage, seconds)
+        values = self.samples.setdefault(stage, [])
+        if len(values) < self.max_samples:
+            values.append(seconds)
+
+    def utterance(self) -> TurnTrace:
+        if self.current is None:
+            self.current = TurnTrace(self._observe)
+        return self.current
+
+    def end_utterance(self) -> TurnTrace:
+        trace = self.utterance()
+        self.current = None
+        return trace
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Per-stage count, median and max in milliseconds for the session summary."""
+        result = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            result[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return result
+
+
+class _StatsCollector:
+    """Exports live session and app stats on each scrape.
+
+    Counters of finished sessions are folded into ``retired`` so totals stay
+    monotonic after a session goes away.
+    """
+
+    def __init__(self, telemetry: Telemetry) -> None:
+        self.telemetry = telemetry
+
+    def collect(self) -> Iterable:
+        counters: dict[str, float] = dict(self.telemetry.retired)
+        gauges: dict[str, float] = {}
+        for sources in list(self.telemetry.sessions.values()):
+            for group, source in sources.items():
+                for name, value in _numeric(source()).items():
+                    key = f"{group}_{name}"
+                    if name in COUNTER_KEYS.get(group, ()):
+                        counters[key] = counters.get(key, 0) + value
+                    else:
+                        gauges[key] = gauges.get(key, 0) + value
+        for group, source in self.telemetry.app_sources.items():
+            for name, value in _numeric(source()).items():
+                target = counters if name in COUNTER_KEYS.get(group, ()) else gauges
+                target[f"{group}_{name}"] = value
+
+        for key, value in sorted(counters.items()):
+            yield CounterMetricFamily(f"{METRIC_PREFIX}_{key}", f"Total {key}.", value=value)
+        for key, value in sorted(gauges.items()):
+            yield GaugeMetricFamily(f"{METRIC_PREFIX}_{key}", f"Current {key}.", value=value)
+
+
+def _numeric(stats: dict) -> dict[str, float]:
+    return {name: value for name, value in stats.items() if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+class Telemetry:
+    """App-wide latency histograms and counters, rendered for Prometheus.
+
+    Spans are always recorded so session summaries carry stage latencies;
+    ``render`` needs ``prometheus_client``.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled and CollectorRegistry is not None
+        self.sessions: dict[int, dict[str, StatsSource]] = {}
+        self.app_sources: dict[str, StatsSource] = {}
+        self.retired: dict[str, float] = {}
+        self._handles = itertools.count(1)
+        if not self.enabled:
+            return
+
+        # A private registry keeps repeated create_app() calls from colliding.
+        self.registry = CollectorRegistry()
+        self.stage_seconds = Histogram(
+            f"{METRIC_PREFIX}_stage_seconds",
+            "Latency of each pipeline stage, measured from the stage it waits on.",
+            ["stage"],
+            buckets=STAGE_BUCKETS,
+            registry=self.registry,
+        )
+        self.active_sessions = Gauge(
+            f"{METRIC_PREFIX}_active_sessions", "Open websocket sessions.", registry=self.registry
+        )
+        self.sessions_total = Counter(
+            f"{METRIC_PREFIX}_sessions", "Websocket sessions opened.", registry=self.registry
+        )
+        self.registry.register(_StatsCollector(self))
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if self.enabled:
+            self.stage_seconds.labels(stage).observe(seconds)
+
+    def tracer(self) -> SessionTracer:
+        return SessionTracer(self.observe)
+
+    def add_app_source(self, group: str, source: StatsSource) -> None:
+        self.app_sources[group] = source
+
+    def open_session(self, sources: dict[str, StatsSource]) -> int:
+        """Start exporting a session's stats; returns the handle for ``close_session``."""
+        handle = next(self._handles)
+        self.sessions[handle] = sources
+        if self.enabled:
+            self.active_sessions.inc()
+            self.sessions_total.inc()
+        return handle
+
+    def close_session(self, handle: int) -> None:
+        sources = self.sessions.pop(handle, None)
+        if sources is None:
+            return
+        for group, source in sources.items():
+            for name, value in _numeric(source()).items():
+                if name in COUNTER_KEYS.get(group, ()):
+                    key = f"{group}_{name}"
+                    self.retired[key] = self.retired.get(key, 0) + value
+        if self.enabled:
+            self.active_sessions.dec()
+
+    def render(self) -> bytes:
+        return generate_latest(self.registry)
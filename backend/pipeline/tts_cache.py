@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class TTSCache:
+    """Content-addressed TTS audio cache with a byte-budgeted LRU and optional disk tier.
+
+    Keys hash everything that changes the rendered audio, so identical requests
+    for the same voice share one entry across sessions. The disk tier has its
+    own budget; files are evicted least recently used first, by mtime.
+    """
+
+    max_bytes: int = 32 * 1024 * 1024
+    max_text_chars: int = 400
+    disk_dir: str | None = None
+    max_disk_bytes: int = 256 * 1024 * 1024
+    entries: OrderedDict[str, bytes] = field(default_factory=OrderedDict)
+    current_bytes: int = 0
+    disk_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    disk_evictions: int = 0
+
+    def __post_init__(self) -> None:
+        if self.disk_dir:
+            Path(self.disk_dir).mkdir(parents=True, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def key(
+        text: str,
+        voice_id: str,
+        model: str,
+        voice_settings: dict[str, Any],
+        output_format: str,
+    ) -> str:
+        material = json.dumps(
+            [text.strip(), voice_id, model, voice_settings, output_format],
+            sort_keys=True,
+            ensure_ascii=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self.max_text_chars
+
+    async def get(self, key: str) -> bytes | None:
+        audio = self.entries.get(key)
+        if audio is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+        if self.disk_dir:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                self._remember(key, audio)
+                self.hits += 1
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        if not audio:
+            return
+        self._remember(key, audio)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, audio)
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_bytes:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= len(previous)
+
+        self.entries[key] = audio
+        self.current_bytes += len(audio)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return Path(self.disk_dir or ".") / key[:2] / f"{key}.audio"
+
+    def _disk_files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in Path(self.disk_dir or ".").glob("*/*.audio"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._path(key)
+        with contextlib.suppress(OSError):
+            audio = path.read_bytes()
+            # A read refreshes the mtime so eviction keeps recently used files.
+            os.utime(path)
+            return audio
+        return None
+
+    def _write_disk(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        with contextlib.suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(f".{os.getpid()}.tmp")
+            previous = path.stat().st_size if path.exists() else 0
+            temporary.write_bytes(audio)
+            os.replace(temporary, path)
+            self.disk_bytes += len(audio) - previous
+        if self.disk_bytes > self.max_disk_bytes:
+            self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        # Rescan rather than trust the running total: other workers share the
+        # directory. Trimming to 90% keeps the scan off every later write.
+        files = sorted(self._disk_files())
+        self.disk_bytes = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if self.disk_bytes <= target:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                self.disk_bytes -= size
+                self.disk_evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "disk_bytes": self.disk_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_evictions": self.disk_evictions,
+        }
@@ -2,27 +2,96 @@ from __future__ import annotations
 
 from collections import Counter, deque
 from dataclasses import dataclass, field
+from typing import NamedTuple
+
+
+class VisualSample(NamedTuple):
+    timestamp: float
+    eye_contact: bool
+    movement: float
+    posture_score: float
+    expression: str
 
 
 @dataclass
 class VisualAnalyzer:
-    """Aggregates visual samples from MediaPipe into stable session signals."""
+    """Aggregates visual samples from MediaPipe into stable session signals.
+
+    Window aggregates are maintained incrementally on ingest and eviction, so
+    reading the current signals costs the same regardless of window size. The
+    window is bounded by ``max_samples`` and, optionally, by ``window_seconds``.
+    """
 
-    samples: deque[dict] = field(default_factory=lambda: deque(maxlen=240))
+    max_samples: int = 240
+    window_seconds: float | None = None
+    samples: deque[VisualSample] = field(default_factory=deque)
+    eye_contact_hits: int = 0
+    movement_sum: float = 0.0
+    posture_sum: float = 0.0
+    expression_counts: Counter[str] = field(default_factory=Counter)
 
     def ingest_signal(self, payload: dict, timestamp: float) -> dict:
-        sample = {
-            "timestamp": timestamp,
-            "eye_contact": bool(payload.get("eyeContact", False)),
-            "head_pose": payload.get("headPose", {"pitch": 0.0, "yaw": 0.0, "roll": 0.0}),
-            "expression": payload.get("expression", "neutral"),
-            "posture_score": float(payload.get("postureScore", 0.0)),
-        }
+        pose = payload.get("headPose") or {}
+        pitch = abs(float(pose.get("pitch", 0.0)))
+        yaw = abs(float(pose.get("yaw", 0.0)))
+        roll = abs(float(pose.get("roll", 0.0)))
+
+        sample = VisualSample(
+            timestamp=timestamp,
+            eye_contact=bool(payload.get("eyeContact", False)),
+            movement=(pitch + yaw + roll) / 3,
+            posture_score=float(payload.get("postureScore", 0.0)),
+            expression=payload.get("expression", "neutral"),
+        )
+
+        self._add(sample)
+        return self.get_current_signals(timestamp)
+
+    def _add(self, sample: VisualSample) -> None:
         self.samples.append(sample)
-        return self.get_current_signals()
+        self.eye_contact_hits += sample.eye_contact
+        self.movement_sum += sample.movement
+        self.posture_sum += sample.posture_score
+        self.expression_counts[sample.expression] += 1
 
-    def get_current_signals(self) -> dict:
+        while len(self.samples) > self.max_samples:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        sample = self.samples.popleft()
         if not self.samples:
+            self._reset_aggregates()
+            return
+
+        self.eye_contact_hits -= sample.eye_contact
+        self.movement_sum -= sample.movement
+        self.posture_sum -= sample.posture_score
+        remaining = self.expression_counts[sample.expression] - 1
+        if remaining > 0:
+            self.expression_counts[sample.expression] = remaining
+        else:
+            del self.expression_counts[sample.expression]
+
+    def _reset_aggregates(self) -> None:
+        # Resetting on empty also discards any accumulated float drift.
+        self.eye_contact_hits = 0
+        self.movement_sum = 0.0
+        self.posture_sum = 0.0
+        self.expression_counts.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        if self.window_seconds is None:
+            return
+        cutoff = now - self.window_seconds
+        while self.samples and self.samples[0].timestamp < cutoff:
+            self._evict_oldest()
+
+    def get_current_signals(self, now: float | None = None) -> dict:
+        if now is not None:
+            self._evict_expired(now)
+
+        count = len(self.samples)
+        if not count:
             return {
                 "eye_contact_percentage": 0.0,
                 "head_movement_level": "low",
@@ -30,23 +99,9 @@ class VisualAnalyzer:
                 "posture_score": 0.0,
             }
 
-        eye_contact_hits = sum(1 for sample in self.samples if sample["eye_contact"])
-        eye_contact_percentage = (eye_contact_hits / len(self.samples)) * 100
+        eye_contact_percentage = (self.eye_contact_hits / count) * 100
 
-        movement_values = []
-        posture_values = []
-        expression_counter: Counter[str] = Counter()
-
-        for sample in self.samples:
-            pose = sample["head_pose"]
-            pitch = abs(float(pose.get("pitch", 0.0)))
-            yaw = abs(float(pose.get("yaw", 0.0)))
-            roll = abs(float(pose.get("roll", 0.0)))
-            movement_values.append((pitch + yaw + roll) / 3)
-            posture_values.append(sample["posture_score"])
-            expression_counter.update([sample["expression"]])
-
-        average_movement = sum(movement_values) / len(movement_values)
+        average_movement = self.movement_sum / count
         if average_movement < 8:
             movement_level = "low"
         elif average_movement < 16:
@@ -54,8 +109,9 @@ class VisualAnalyzer:
         else:
             movement_level = "high"
 
-        dominant_expression = expression_counter.most_common(1)[0][0]
-        posture_score = sum(posture_values) / len(posture_values)
+        # Bounded by the handful of distinct expression labels, not the window.
+        dominant_expression = max(self.expression_counts, key=self.expression_counts.__getitem__)
+        posture_score = self.posture_sum / count
 
         return {
             "eye_contact_percentage": round(eye_contact_percentage, 1),
@@ -63,3 +119,13 @@ class VisualAnalyzer:
             "facial_expression": dominant_expression,
             "posture_score": round(max(0.0, min(1.0, posture_score)), 2),
         }
+
+    def snapshot(self) -> dict:
+        return {"samples": [tuple(sample) for sample in self.samples]}
+
+    def restore(self, state: dict) -> None:
+        """Replace the window with saved samples; aggregates are rebuilt from them."""
+        self.samples.clear()
+        self._reset_aggregates()
+        for sample in state["samples"]:
+            self._add(VisualSample(*sample))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency during bootstrap
+    np = None  # type: ignore
+
+
+@dataclass
+class VadDecision:
+    rms: float
+    speaking: bool
+    end_of_speech: bool
+    forward: list[bytes | memoryview] = field(default_factory=list)
+
+
+@dataclass
+class VoiceActivityDetector:
+    """Frame-level energy/ZCR voice-activity detector over PCM16 chunks."""
+
+    frame_ms: float = 20.0
+    min_speech_rms: float = 0.012
+    speech_to_noise_ratio: float = 3.0
+    max_zero_crossing_rate: float = 0.4
+    noise_adapt_rate: float = 0.05
+    min_speech_ms: float = 60.0
+    hangover_ms: float = 350.0
+    pre_roll_ms: float = 200.0
+    noise_floor: float = 0.0
+    speaking: bool = False
+    voiced_run_ms: float = 0.0
+    silence_ms: float = 0.0
+    pre_roll: deque[tuple[float, bytes | memoryview]] = field(default_factory=deque)
+    pre_roll_duration_ms: float = 0.0
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def process(self, pcm: bytes | memoryview, sample_rate: int) -> VadDecision:
+        """Classify one chunk and return the audio that should be forwarded upstream.
+
+        Silent chunks are held back in a short pre-roll buffer so word onsets are
+        not clipped when speech starts, and dropped otherwise.
+        """
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+        if samples.size == 0:
+            return VadDecision(rms=0.0, speaking=self.speaking, end_of_speech=False)
+
+        signal = samples.astype(np.float32) * (1.0 / 32768.0)
+        chunk_ms = samples.size * 1000.0 / sample_rate
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        frame_count = signal.size // frame_length
+
+        if frame_count == 0:
+            frames = signal.reshape(1, -1)
+            frame_ms = chunk_ms
+        else:
+            frames = signal[: frame_count * frame_length].reshape(frame_count, frame_length)
+            frame_ms = self.frame_ms
+
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zero_crossing_rate = np.mean(signs[:, 1:] != signs[:, :-1], axis=1) if frames.shape[1] > 1 else 0.0
+
+        if self.noise_floor <= 0.0:
+            self.noise_floor = float(np.min(energy))
+
+        threshold = max(self.min_speech_rms, self.noise_floor * self.speech_to_noise_ratio)
+        voiced = (energy > threshold) & (zero_crossing_rate < self.max_zero_crossing_rate)
+        self._adapt_noise_floor(energy[~voiced])
+
+        rms = float(np.sqrt(np.mean(signal * signal)))
+        voiced_frames = int(np.count_nonzero(voiced))
+        end_of_speech = False
+
+        if voiced_frames:
+            last_voiced = int(np.flatnonzero(voiced)[-1])
+            self.voiced_run_ms += voiced_frames * frame_ms
+            trailing_silence_ms = (voiced.size - 1 - last_voiced) * frame_ms
+        else:
+            self.voiced_run_ms = 0.0
+            trailing_silence_ms = chunk_ms
+
+        if not self.speaking:
+            if self.voiced_run_ms < self.min_speech_ms:
+                self._hold_pre_roll(pcm, chunk_ms)
+                return VadDecision(rms=rms, speaking=False, end_of_speech=False)
+
+            self.speaking = True
+            self.silence_ms = trailing_silence_ms
+            forward = [chunk for _, chunk in self.pre_roll]
+            forward.append(pcm)
+            self.pre_roll.clear()
+            self.pre_roll_duration_ms = 0.0
+            return VadDecision(rms=rms, speaking=True, end_of_speech=False, forward=forward)
+
+        self.silence_ms = trailing_silence_ms if voiced_frames else self.silence_ms + chunk_ms
+        if self.silence_ms >= self.hangover_ms:
+            self.speaking = False
+            self.voiced_run_ms = 0.0
+            self.silence_ms = 0.0
+            end_of_speech = True
+
+        return VadDecision(rms=rms, speaking=self.speaking, end_of_speech=end_of_speech, forward=[pcm])
+
+    def _adapt_noise_floor(self, unvoiced_energy) -> None:
+        if unvoiced_energy.size == 0:
+            return
+        # One EMA step per unvoiced frame, folded into a single update.
+        rate = 1.0 - (1.0 - self.noise_adapt_rate) ** unvoiced_energy.size
+        target = float(np.mean(unvoiced_energy))
+        self.noise_floor = min(target, self.noise_floor + rate * (target - self.noise_floor))
+
+    def _hold_pre_roll(self, pcm: bytes | memoryview, chunk_ms: float) -> None:
+        self.pre_roll.append((chunk_ms, pcm))
+        self.pre_roll_duration_ms += chunk_ms
+        while len(self.pre_roll) > 1 and self.pre_roll_duration_ms - self.pre_roll[0][0] >= self.pre_roll_ms:
+            dropped_ms, _ = self.pre_roll.popleft()
+            self.pre_roll_duration_ms -= dropped_ms
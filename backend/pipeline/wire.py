@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency during bootstrap
+    orjson = None  # type: ignore
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency during bootstrap
+    msgpack = None  # type: ignore
+
+
+@dataclass(frozen=True)
+class WireCodec:
+    """Serializer for session messages; binary codecs travel as binary frames."""
+
+    name: str
+    binary: bool
+    encode: Callable[[Any], str | bytes]
+    decode: Callable[[str | bytes], Any]
+
+
+def _stdlib_dumps(payload: Any) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+if orjson is not None:
+
+    def fast_dumps(payload: Any) -> str:
+        return orjson.dumps(payload).decode("utf-8")
+
+    fast_loads: Callable[[str | bytes], Any] = orjson.loads
+else:  # pragma: no cover - depends on optional dependency
+    fast_dumps = _stdlib_dumps
+    fast_loads = json.loads
+
+
+CODECS: dict[str, WireCodec] = {
+    "json": WireCodec("json", binary=False, encode=_stdlib_dumps, decode=json.loads),
+}
+
+if orjson is not None:
+    CODECS["json-fast"] = WireCodec("json-fast", binary=False, encode=fast_dumps, decode=orjson.loads)
+
+if msgpack is not None:
+    CODECS["msgpack"] = WireCodec(
+        "msgpack",
+        binary=True,
+        encode=lambda payload: msgpack.packb(payload, use_bin_type=True),
+        decode=lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+SUBPROTOCOL_PREFIX = "speechcoach."
+DEFAULT_CODEC = CODECS["json"]
+
+
+def negotiate(subprotocols: list[str], requested: str | None = None) -> tuple[WireCodec, str | None]:
+    """Pick a codec from the client's offered subprotocols or ``?protocol=`` value.
+
+    Returns the codec and the subprotocol to echo in the handshake, if any.
+    Unknown or unavailable codecs fall back to stdlib JSON.
+    """
+    for offered in subprotocols:
+        if offered.startswith(SUBPROTOCOL_PREFIX):
+            codec = CODECS.get(offered[len(SUBPROTOCOL_PREFIX) :])
+            if codec:
+                return codec, offered
+
+    if requested and requested in CODECS:
+        return CODECS[requested], None
+
+    return DEFAULT_CODEC, None